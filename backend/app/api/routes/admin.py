@@ -0,0 +1,121 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from typing import AsyncIterator, Literal, Optional, Tuple
+import asyncio
+import hmac
+import json
+import logging
+
+from app.core.catalog import catalog_poller
+from app.core.config import settings
+from app.core.storage import StagedImport, catalog_store
+
+logger = logging.getLogger(__name__)
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """Check the bearer token; the admin API is off unless ADMIN_TOKEN is set"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="The admin API is disabled")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip(), settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into numbered lines without buffering more than one line
+
+    Args:
+        chunks: Body chunks as they arrive
+        max_line_bytes: Longest line kept; a longer one is yielded as None and discarded
+
+    Yields:
+        Tuples of (1-based line number, line bytes or None)
+    """
+    buffer = b""
+    number = 0
+    skipping = False
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            number += 1
+            if skipping:
+                # Tail of an over-long line, already reported
+                skipping = False
+                continue
+            yield number, line if len(line) <= max_line_bytes else None
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield number + 1, None
+                skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield number + 1, buffer if len(buffer) <= max_line_bytes else None
+
+@router.post("/import/{catalog}", summary="Bulk import projects or skills from NDJSON")
+async def import_catalog(catalog: Literal["projects", "skills"], request: Request):
+    """
+    Replace a catalog with the rows of a newline-delimited JSON upload.
+
+    The body is read as it streams in, one JSON object per line, each
+    validated against ProjectBase or SkillBase (``id`` is optional). The
+    new catalog replaces the old one atomically, and only if every row is
+    valid; readers keep getting the old catalog until then.
+
+    Returns:
+        Import report with the accepted and rejected row counts, the new
+        catalog version and per-row errors (status 422 if any row was
+        rejected, in which case nothing changed)
+
+    Raises:
+        HTTPException: If the upload has no rows
+    """
+    staged = await asyncio.to_thread(
+        StagedImport, catalog_store, catalog, source="admin import", batch_size=settings.IMPORT_BATCH_SIZE
+    )
+    rows = 0
+    try:
+        async for line, text in iter_lines(request.stream(), settings.IMPORT_MAX_LINE_BYTES):
+            if text is None:
+                rows += 1
+                staged.reject(line, f"line is longer than {settings.IMPORT_MAX_LINE_BYTES} bytes")
+                continue
+            if not text.strip():
+                continue
+            rows += 1
+            try:
+                row = json.loads(text)
+            except ValueError as e:
+                staged.reject(line, f"invalid JSON: {e}")
+                continue
+            if staged.add(line, row):
+                await asyncio.to_thread(staged.flush)
+        if not rows:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The upload has no rows")
+        version = await asyncio.to_thread(staged.commit)
+    finally:
+        await asyncio.to_thread(staged.close)
+    if version is not None:
+        # Serve the new catalog from this worker right away; the others pick it up on their next refresh
+        await catalog_poller.refresh(catalog)
+
+    if version is None:
+        logger.warning(f"Rejected {catalog} import: {staged.rejected} of {rows} rows invalid")
+    return JSONResponse(
+        status_code=200 if version is not None else 422,
+        content={
+            "catalog": catalog,
+            "imported": staged.accepted if version is not None else 0,
+            "rejected": staged.rejected,
+            "version": version,
+            "errors": sorted(staged.errors, key=lambda error: error["line"]),
+        },
+    )
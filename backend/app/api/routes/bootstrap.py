@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from typing import Any, Callable, Dict, List, Tuple
+import hashlib
+
+from app.api.routes.chatbot import PROFILE
+from app.api.routes.skills import SKILLS_DATA, STATIC_SKILLS_VERSION
+from app.core.models import BootstrapPayload, Project
+from app.core.repository import project_repository
+from app.utils.http_cache import response_cache
+
+router = APIRouter()
+
+# Sections of the payload, in order
+SECTIONS = ("projects", "featured", "skill_categories", "profile")
+
+# The profile is the one the chatbot answers from, so it only changes on deploy
+STATIC_PROFILE_VERSION = "static"
+
+def section_sources() -> Dict[str, Tuple[str, Callable[[], Any]]]:
+    """(version of the data behind it, builder) for each section"""
+    projects = project_repository.snapshot()
+    return {
+        "projects": (projects.version, lambda: [Project(**project) for project in projects.items]),
+        "featured": (projects.version, lambda: [Project(**project) for project in projects.indexes["featured"]]),
+        "skill_categories": (STATIC_SKILLS_VERSION, lambda: SKILLS_DATA["categories"]),
+        "profile": (STATIC_PROFILE_VERSION, lambda: PROFILE),
+    }
+
+def parse_include(include: List[str]) -> List[str]:
+    """
+    Resolve ?include= into known sections in payload order
+
+    Accepts repeated and comma-separated values; empty means every section.
+
+    Raises:
+        HTTPException: If a section name is unknown
+    """
+    requested = {name.strip() for value in include for name in value.split(",") if name.strip()}
+    unknown = requested.difference(SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown section(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(SECTIONS)}"
+        )
+    return [name for name in SECTIONS if not requested or name in requested]
+
+@router.get("", response_model=BootstrapPayload, summary="Get first-paint data in one request")
+async def get_bootstrap(
+    request: Request,
+    include: List[str] = Query([], description="Sections to return, e.g. ?include=projects,profile (default: all)"),
+):
+    """
+    Retrieve everything the first page render needs in a single response.
+    
+    The payload for each combination of sections is encoded once per data
+    version and served with an ETag, so repeat visits get a 304. Its
+    "version" field changes whenever any included section changes.
+    
+    Returns:
+        BootstrapPayload with the requested sections
+        
+    Raises:
+        HTTPException: If include names an unknown section
+    """
+    sections = parse_include(include)
+    sources = section_sources()
+    version = hashlib.sha256(
+        "|".join(f"{name}:{sources[name][0]}" for name in sections).encode()
+    ).hexdigest()[:16]
+
+    def build() -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"version": version}
+        for name in sections:
+            payload[name] = sources[name][1]()
+        return payload
+
+    return response_cache.respond(request, "bootstrap:" + ",".join(sections), version, build)
@@ -1,29 +1,58 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-import google.generativeai as genai
-import os
-from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
+import asyncio
+import json
 import logging
+import time
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from app.api.routes.admin import require_admin
+
+from app.core.admission import chat_admission
+from app.core.circuit_breaker import CircuitOpenError, gemini_breaker
+from app.core.clients import google_clients
+from app.core.config import settings
+from app.core.metrics import chat_fallbacks, gemini_duration, registry
+from app.core.repository import project_repository, skill_repository
+from app.core.retrieval import (
+    ContextRetriever,
+    chunk_personal_context,
+    chunk_projects,
+    chunk_skills,
+    estimate_tokens,
+)
+from app.core.sessions import Turn, chat_sessions, format_history
+from app.utils.cache import ResponseCache
+from app.utils.singleflight import SingleFlight
+from app.utils.text import normalize_question
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Profile facts shared by the Gemini context below and the /api/bootstrap profile section
+PROFILE = {
+    "name": "Onkar Arjun Mundhe",
+    "title": "Data and DevOps Intern",
+    "company": "Predusk Technology Pvt. Ltd.",
+    "education": "Pursuing B.Tech in Computer Science and Engineering at IIT Goa",
+    "location": "Pune, India",
+    "email": "onkarmundhe995@gmail.com",
+    "about": "Final year student at IIT Goa working on data pipelines and infrastructure automation.",
+}
+
 # Define the context about you
-PERSONAL_CONTEXT = """
-I am Onkar Arjun Mundhe, a final year student at IIT Goa and currently working as a Data and DevOps Intern at Predusk Technology Pvt. Ltd.
+PERSONAL_CONTEXT = f"""
+I am {PROFILE["name"]}, a final year student at IIT Goa and currently working as a {PROFILE["title"]} at {PROFILE["company"]}
 
 Education:
 - Currently pursuing B.Tech at IIT Goa
 - Specializing in Computer Science and Engineering
 
 Experience:
-- Data and DevOps Intern at Predusk Technology Pvt. Ltd.
+- {PROFILE["title"]} at {PROFILE["company"]}
 - Working on data pipelines and infrastructure automation
 
 Skills:
@@ -49,9 +78,9 @@ Projects:
    - Uses natural language processing for text extraction and summarization
    - Technologies: Python, PDF Processing
 
-Location: Pune, India
+Location: {PROFILE["location"]}
 Hometown: Pune
-Contact: onkarmundhe995@gmail.com
+Contact: {PROFILE["email"]}
 """
 
 # Hard-coded responses for common questions as fallback
@@ -65,8 +94,27 @@ FALLBACK_RESPONSES = {
     "default": "I'm Onkar's portfolio assistant. I can provide information about his education, experience, skills, and projects. How can I help you today?"
 }
 
+# Gemini answers for repeated questions; fallbacks are cheap and never cached
+response_cache = ResponseCache(
+    ttl_seconds=settings.CHAT_CACHE_TTL_SECONDS,
+    max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+    similarity_threshold=settings.CHAT_CACHE_SIMILARITY,
+)
+
+# Identical questions asked at the same moment share one Gemini call
+gemini_flight = SingleFlight()
+
 class ChatMessage(BaseModel):
     message: str
+    # "new" to start a conversation, then the session_id returned by the previous answer
+    session_id: Optional[str] = Field(None, max_length=64)
+
+class ChatBatchRequest(BaseModel):
+    messages: List[str]
+    # At most CHAT_BATCH_CONCURRENCY; lower it to go easier on Gemini
+    concurrency: Optional[int] = Field(None, ge=1)
+    # Stream results as NDJSON in completion order instead of one JSON body in input order
+    stream: bool = False
 
 def get_fallback_response(message: str) -> str:
     """Determine a fallback response based on message keywords"""
@@ -87,60 +135,592 @@ def get_fallback_response(message: str) -> str:
     else:
         return FALLBACK_RESPONSES["default"]
 
-# Initialize Gemini when API key is available
-gemini_available = False
-model = None
-
-try:
-    api_key = os.getenv('GEMINI_API_KEY')
-    if api_key:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        gemini_available = True
-        logger.info("Gemini API initialized successfully")
+def build_prompt(message: str, context: str = PERSONAL_CONTEXT, history: str = "") -> str:
+    """Construct the Gemini prompt for a question, with the personal context and earlier turns"""
+    conversation = f"""Conversation so far:
+                {history}
+                
+                """ if history else ""
+    return f"""You are a professional assistant that only answers questions about Onkar Mundhe based on the following information. 
+                If the question is not related to this information or you're unsure, politely say you can only answer questions about Onkar's education, experience, skills, and projects.
+                
+                Context:
+                {context}
+                
+                {conversation}Question: {message}
+                
+                Please provide a concise and relevant answer based only on the information provided above."""
+
+def retrieval_sources():
+    """
+    (version, chunk builder) for every source the retrieval index covers
+
+    The rule-based chatbot's knowledge base is left out: its profile,
+    projects and FAQs predate PERSONAL_CONTEXT and contradict it.
+    """
+    projects = project_repository.snapshot()
+    skills = skill_repository.snapshot()
+    return [
+        ("personal_context", lambda: chunk_personal_context(PERSONAL_CONTEXT)),
+        (projects.version, lambda: chunk_projects(projects.items)),
+        (skills.version, lambda: chunk_skills(skills.items)),
+    ]
+
+context_retriever = ContextRetriever(retrieval_sources)
+
+def warm_up_retrieval_index():
+    """Build the retrieval index in the background instead of on the first chat"""
+    if settings.RETRIEVAL_ENABLED:
+        asyncio.get_running_loop().run_in_executor(None, context_retriever.index)
+
+FULL_PROMPT_TOKENS = estimate_tokens(build_prompt(""))
+
+def prepare_prompt(message: str, turns: Sequence[Turn] = ()) -> Tuple[Optional[str], str]:
+    """
+    Retrieve the context relevant to a question and build the Gemini prompt.
+    
+    Args:
+        message: The question
+        turns: Earlier turns of the conversation, oldest first
+    
+    Returns:
+        Tuple of (answer taken straight from a chunk when the question
+        clearly asks about that one chunk, else None; prompt to send to Gemini)
+    """
+    history = format_history(turns, settings.CHAT_SESSION_HISTORY_TOKENS)
+    if not settings.RETRIEVAL_ENABLED:
+        return None, build_prompt(message, history=history)
+
+    # A follow-up ("what stack did it use?") is retrieved together with the question before it
+    query = f"{turns[-1][0]} {message}" if turns else message
+    retrieval = context_retriever.retrieve(query, settings.RETRIEVAL_TOP_K)
+    best = retrieval.chunks[0] if retrieval.chunks else None
+    # Only a question that singles out one chunk (e.g. names a project) skips Gemini
+    if (
+        best is not None
+        and best.answer
+        and retrieval.distinctive
+        and retrieval.confidence >= settings.RETRIEVAL_DIRECT_ANSWER_CONFIDENCE
+        and retrieval.margin >= settings.RETRIEVAL_DIRECT_ANSWER_MARGIN
+    ):
+        logger.info(
+            f"Answered from retrieval (confidence {retrieval.confidence:.2f}, margin {retrieval.margin:.1f})"
+        )
+        return best.answer, ""
+
+    # Nothing relevant retrieved (e.g. small talk): keep the full profile
+    prompt = build_prompt(message, retrieval.context if best is not None else PERSONAL_CONTEXT, history)
+    logger.info(
+        f"Prompt ~{estimate_tokens(prompt)} tokens from {len(retrieval.chunks)} chunks "
+        f"(full context ~{FULL_PROMPT_TOKENS + estimate_tokens(message)})"
+    )
+    return None, prompt
+
+# Use Gemini when an API key is configured; the SDK itself is loaded on first use
+gemini_available = google_clients.gemini_enabled
+
+async def get_gemini_model() -> Any:
+    """
+    Get the shared Gemini model, importing the SDK in a worker thread on first use
+
+    Raises:
+        RuntimeError: If the model could not be initialized
+    """
+    if google_clients.gemini_loaded:
+        model = google_clients.gemini_model()
     else:
-        logger.warning("GEMINI_API_KEY not found in environment variables")
-except Exception as e:
-    logger.error(f"Error initializing Gemini API: {str(e)}")
+        model = await asyncio.to_thread(google_clients.gemini_model)
+    if model is None:
+        raise RuntimeError("Gemini model is not initialized")
+    return model
 
-@router.post("/chat")
-async def chat_with_bot(chat_message: ChatMessage):
+# Created on first use so it binds to the running event loop
+_gemini_semaphore: Optional[asyncio.Semaphore] = None
+
+def get_gemini_semaphore() -> asyncio.Semaphore:
+    """Semaphore bounding the number of concurrent Gemini calls"""
+    global _gemini_semaphore
+    if _gemini_semaphore is None:
+        _gemini_semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+    return _gemini_semaphore
+
+@asynccontextmanager
+async def gemini_slot(timeout: float) -> AsyncIterator[None]:
+    """
+    Hold one Gemini concurrency slot, waiting at most ``timeout`` seconds for it.
+    
+    The acquire runs as its own task instead of under wait_for: before
+    Python 3.12, wait_for can cancel an acquire that already succeeded,
+    and the slot would never be released. If the wait ends (timeout or
+    cancellation) after the task got the slot, it is released here.
+    
+    Raises:
+        asyncio.TimeoutError: If no slot frees up in time
+    """
+    semaphore = get_gemini_semaphore()
+    acquire = asyncio.ensure_future(semaphore.acquire())
+    try:
+        done, _ = await asyncio.wait({acquire}, timeout=timeout)
+        if not done:
+            raise asyncio.TimeoutError()
+    except BaseException:
+        if acquire.done() and not acquire.cancelled():
+            semaphore.release()
+        else:
+            acquire.cancel()
+        raise
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+_batch_semaphore: Optional[asyncio.Semaphore] = None
+
+def batch_concurrency() -> int:
+    """Messages all batch requests together may answer at once, one below the Gemini slots (at least 1)"""
+    return max(1, min(settings.CHAT_BATCH_CONCURRENCY, settings.GEMINI_MAX_CONCURRENCY - 1))
+
+def get_batch_semaphore() -> asyncio.Semaphore:
+    """Semaphore shared by every batch request, so batches never take all the Gemini slots"""
+    global _batch_semaphore
+    if _batch_semaphore is None:
+        _batch_semaphore = asyncio.Semaphore(batch_concurrency())
+    return _batch_semaphore
+
+async def generate_gemini_response(prompt: str) -> str:
+    """
+    Generate a Gemini response without blocking the event loop.
+    
+    Fails fast while the circuit breaker is open. The wait for a
+    concurrency slot counts against GEMINI_TIMEOUT_SECONDS; the upstream
+    call itself gets the breaker's latency-derived timeout, and only its
+    outcome feeds the breaker.
+    
+    Raises:
+        CircuitOpenError: If the breaker is not letting calls through
+        asyncio.TimeoutError: If the deadline expires; the upstream call is cancelled
+    """
+    gemini_breaker.check()
+    model = await get_gemini_model()
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.GEMINI_TIMEOUT_SECONDS
+    async with gemini_slot(settings.GEMINI_TIMEOUT_SECONDS):
+        timeout = min(gemini_breaker.timeout(), deadline - loop.time())
+        if timeout <= 0:
+            raise asyncio.TimeoutError()
+        with gemini_breaker.guard() as call:
+            with gemini_duration.time("generate") as timer:
+                response = await asyncio.wait_for(model.generate_content_async(prompt), timeout=timeout)
+                text = response.text
+            call.succeeded(timer.elapsed)
+            return text
+
+async def stream_gemini_response(prompt: str) -> AsyncIterator[str]:
+    """
+    Yield Gemini output text as it is generated.
+    
+    The upstream stream is consumed by its own task, so closing this
+    generator (e.g. when the client disconnects) cancels the RPC and frees
+    the concurrency slot. GEMINI_TIMEOUT_SECONDS bounds the wait for a
+    slot, for the first chunk and for the gap between chunks; stalls and
+    errors count as failures for the circuit breaker.
+    
+    Raises:
+        CircuitOpenError: If the breaker is not letting calls through
+        asyncio.TimeoutError: If no chunk arrives within the deadline
+    """
+    gemini_breaker.check()
+    model = await get_gemini_model()
+
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+    timeout = settings.GEMINI_TIMEOUT_SECONDS
+
+    async def pump() -> None:
+        try:
+            async with gemini_slot(timeout):
+                with gemini_breaker.guard() as call, gemini_duration.time("stream"):
+                    response = await asyncio.wait_for(
+                        model.generate_content_async(prompt, stream=True), timeout=timeout
+                    )
+                    chunks = response.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                        except StopAsyncIteration:
+                            break
+                        await queue.put(chunk.text)
+                    # Whole-answer time depends on its length, so it is not a latency sample
+                    call.succeeded()
+            await queue.put(finished)
+        except Exception as e:
+            await queue.put(e)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+def format_sse(data: dict, event: Optional[str] = None) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+async def answer_chat_message(message: str, session_id: Optional[str] = None) -> dict:
+    """
+    Answer one chat message with Gemini, the cache or the keyword fallback
+    
+    With a session_id, the session's earlier turns go into the prompt, the
+    turn is recorded and the id is returned with the answer.
+    """
+    if session_id is None:
+        return await answer_with_history(message, ())
+    result = await answer_with_history(message, chat_sessions.turns(session_id))
+    chat_sessions.record(session_id, message, result["response"])
+    return {**result, "session_id": session_id}
+
+async def answer_with_history(message: str, turns: Sequence[Turn]) -> dict:
+    """Answer one chat message given the earlier turns of its conversation"""
     try:
-        message = chat_message.message
         logger.info(f"Received message: {message}")
         
         # Use Gemini if available
-        if gemini_available and model:
+        if gemini_available:
+            # Answers to follow-ups depend on the conversation, so only standalone questions are cached
+            cached = response_cache.get(message) if not turns else None
+            if cached is not None:
+                logger.info("Serving cached response")
+                return {"response": cached}
+
             try:
-                # Construct the prompt with context
-                prompt = f"""You are a professional assistant that only answers questions about Onkar Mundhe based on the following information. 
-                If the question is not related to this information or you're unsure, politely say you can only answer questions about Onkar's education, experience, skills, and projects.
-                
-                Context:
-                {PERSONAL_CONTEXT}
-                
-                Question: {message}
-                
-                Please provide a concise and relevant answer based only on the information provided above."""
+                # Construct the prompt with the relevant context
+                direct_answer, prompt = prepare_prompt(message, turns)
+                if direct_answer is not None:
+                    return {"response": direct_answer}
 
                 # Generate response using Gemini with timeout
                 logger.info("Sending request to Gemini API")
-                response = model.generate_content(prompt)
+                async def generate_and_cache() -> str:
+                    text = await generate_gemini_response(prompt)
+                    if not turns:
+                        response_cache.set(message, text)
+                    return text
+
+                if turns:
+                    response_text = await generate_gemini_response(prompt)
+                else:
+                    response_text = await gemini_flight.do(normalize_question(message), generate_and_cache)
                 logger.info("Received response from Gemini API")
                 
-                return {"response": response.text}
+                return {"response": response_text}
             
+            except CircuitOpenError:
+                logger.info("Gemini circuit open, serving fallback response")
+                chat_fallbacks.inc("circuit_open")
+                return {"response": get_fallback_response(message)}
+            except asyncio.TimeoutError:
+                logger.warning("Gemini API timed out")
+                chat_fallbacks.inc("timeout")
+                return {"response": get_fallback_response(message)}
             except Exception as gemini_error:
                 logger.error(f"Gemini API error: {str(gemini_error)}")
+                chat_fallbacks.inc("error")
                 # Fall back to rule-based responses
                 fallback = get_fallback_response(message)
                 return {"response": fallback}
         else:
             # Use fallback responses when Gemini is not available
             logger.info("Using fallback response system")
+            chat_fallbacks.inc("unavailable")
             fallback = get_fallback_response(message)
             return {"response": fallback}
             
     except Exception as e:
         logger.error(f"Unexpected error in chat endpoint: {str(e)}")
-        raise HTTPException(status_code=500, detail="An unexpected error occurred while processing your request.") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="An unexpected error occurred while processing your request.")
+
+@router.post("/chat")
+async def chat_with_bot(chat_message: ChatMessage, request: Request):
+    chat_admission.check_rate(request)
+    with chat_admission.slot() as admitted:
+        if not admitted:
+            # Saturated: degrade instead of queuing behind other LLM calls
+            logger.warning("Chat endpoint saturated, serving fallback response")
+            chat_fallbacks.inc("saturated")
+            return {"response": get_fallback_response(chat_message.message)}
+        session_id = chat_sessions.resolve(chat_message.session_id)
+        return await answer_chat_message(chat_message.message, session_id)
+
+def done_event(session_id: Optional[str]) -> str:
+    """Closing SSE event of a streamed answer, carrying the session_id if there is one"""
+    return format_sse({"session_id": session_id} if session_id else {}, event="done")
+
+async def stream_chat_events(message: str, request: Request, session_id: Optional[str]) -> AsyncIterator[str]:
+    """SSE events answering one message and recording the turn; see chat_with_bot_stream"""
+    turns = chat_sessions.turns(session_id) if session_id else []
+    done = done_event(session_id)
+
+    def record(answer: str) -> None:
+        if session_id:
+            chat_sessions.record(session_id, message, answer)
+
+    def fallback_events() -> List[str]:
+        fallback = get_fallback_response(message)
+        record(fallback)
+        return [format_sse({"text": fallback, "fallback": True}), done]
+
+    sent_any = False
+    if gemini_available:
+        cached = response_cache.get(message) if not turns else None
+        if cached is not None:
+            record(cached)
+            yield format_sse({"text": cached})
+            yield done
+            return
+
+        try:
+            direct_answer, prompt = prepare_prompt(message, turns)
+        except Exception as prompt_error:
+            # The SSE headers are already sent, so answer instead of failing the request
+            logger.error(f"Error preparing the Gemini prompt: {str(prompt_error)}")
+            chat_fallbacks.inc("error")
+            for event in fallback_events():
+                yield event
+            return
+        if direct_answer is not None:
+            record(direct_answer)
+            yield format_sse({"text": direct_answer})
+            yield done
+            return
+
+        chunks = stream_gemini_response(prompt)
+        parts = []
+        # Fallback reason if nothing was streamed; "empty" when Gemini sent no text
+        reason = "empty"
+        try:
+            async for text in chunks:
+                if await request.is_disconnected():
+                    logger.info("Client disconnected, cancelling Gemini stream")
+                    return
+                sent_any = True
+                parts.append(text)
+                yield format_sse({"text": text})
+            if not turns:
+                response_cache.set(message, "".join(parts))
+        except CircuitOpenError:
+            logger.info("Gemini circuit open, serving fallback response")
+            reason = "circuit_open"
+        except asyncio.TimeoutError:
+            logger.warning(f"Gemini stream timed out after {settings.GEMINI_TIMEOUT_SECONDS}s")
+            reason = "timeout"
+        except Exception as gemini_error:
+            logger.error(f"Gemini API streaming error: {str(gemini_error)}")
+            reason = "error"
+        finally:
+            await chunks.aclose()
+
+        if sent_any:
+            # A stream cut short is recorded as far as it got
+            record("".join(parts))
+            yield done
+            return
+        chat_fallbacks.inc(reason)
+    else:
+        logger.info("Using fallback response system")
+        chat_fallbacks.inc("unavailable")
+
+    for event in fallback_events():
+        yield event
+
+@router.post("/chat/stream")
+async def chat_with_bot_stream(chat_message: ChatMessage, request: Request):
+    """
+    Stream the answer as Server-Sent Events.
+    
+    Each "message" event carries {"text": ...} with the next piece of the
+    answer; a final "done" event closes the stream, carrying
+    {"session_id": ...} when the request asked for a session. When Gemini
+    is unavailable or fails before producing output, the fallback response
+    is sent as a single event.
+    """
+    chat_admission.check_rate(request)
+    message = chat_message.message
+    session_id = chat_sessions.resolve(chat_message.session_id)
+    logger.info(f"Received streaming message: {message}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        with chat_admission.slot() as admitted:
+            if not admitted:
+                logger.warning("Chat endpoint saturated, serving fallback response")
+                chat_fallbacks.inc("saturated")
+                yield format_sse({"text": get_fallback_response(message), "fallback": True})
+                yield done_event(session_id)
+                return
+            events = stream_chat_events(message, request, session_id)
+            try:
+                async for event in events:
+                    yield event
+            finally:
+                # Runs the Gemini stream's cleanup now rather than at garbage collection
+                await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def answer_batch(messages: List[str], concurrency: int) -> AsyncIterator[dict]:
+    """
+    Answer messages with up to ``concurrency`` in progress at once.
+    
+    Each message goes through answer_chat_message, so it gets the same
+    cache, retrieval, Gemini limits and fallbacks as a live chat. Every
+    message also holds the process-wide batch semaphore while it is
+    answered, so concurrent batches share batch_concurrency() slots.
+    
+    Yields:
+        {"index", "response" or "error", "latency_ms"} per message, in completion order
+    """
+    pending = iter(enumerate(messages))
+    results: asyncio.Queue = asyncio.Queue()
+    semaphore = get_batch_semaphore()
+
+    async def worker() -> None:
+        # Workers share one iterator, so each message is taken exactly once
+        for index, message in pending:
+            await semaphore.acquire()
+            started = time.perf_counter()
+            try:
+                item = {"index": index, "response": (await answer_chat_message(message))["response"]}
+            except HTTPException as e:
+                item = {"index": index, "error": e.detail}
+            except Exception as e:
+                logger.error(f"Batch chat error: {str(e)}")
+                item = {"index": index, "error": "An unexpected error occurred"}
+            finally:
+                semaphore.release()
+            item["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            await results.put(item)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(messages)))]
+    try:
+        for _ in range(len(messages)):
+            yield await results.get()
+    finally:
+        # Stops outstanding work when the client goes away mid-stream
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+@router.post("/chat/batch", dependencies=[Depends(require_admin)])
+async def chat_batch(batch: ChatBatchRequest):
+    """
+    Answer a list of messages concurrently (offline evaluation, cache pre-warming).
+    
+    Requires the admin token. Batch messages bypass the live chat's
+    admission slots. Instead, all batch requests together answer at most
+    batch_concurrency() messages at once, which is CHAT_BATCH_CONCURRENCY
+    capped one below GEMINI_MAX_CONCURRENCY. So batches never hold or
+    queue for every Gemini slot, and at least one slot is left for live
+    chats. With GEMINI_MAX_CONCURRENCY=1 there is no spare slot, and
+    batches and live chats take turns.
+    
+    Returns:
+        {"results": [...], "elapsed_ms": ...} with results in input order,
+        or with stream=true an NDJSON stream of results in completion order
+    
+    Raises:
+        HTTPException: If the batch is empty or too large
+    """
+    if not batch.messages or len(batch.messages) > settings.CHAT_BATCH_MAX_MESSAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Send between 1 and {settings.CHAT_BATCH_MAX_MESSAGES} messages",
+        )
+    concurrency = min(batch.concurrency or batch_concurrency(), batch_concurrency())
+    logger.info(f"Answering a batch of {len(batch.messages)} messages, {concurrency} at a time")
+
+    if batch.stream:
+        async def result_lines() -> AsyncIterator[str]:
+            results = answer_batch(batch.messages, concurrency)
+            try:
+                async for item in results:
+                    yield json.dumps(item) + "\n"
+            finally:
+                await results.aclose()
+
+        return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+    started = time.perf_counter()
+    results = [item async for item in answer_batch(batch.messages, concurrency)]
+    results.sort(key=lambda item: item["index"])
+    return {"results": results, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+@router.get("/cache/stats")
+async def get_chat_cache_stats():
+    """Hit/miss counters for the chat response cache"""
+    return response_cache.stats()
+
+@router.get("/sessions/stats")
+async def get_chat_session_stats():
+    """Live chat sessions, their memory against the cap and eviction counters"""
+    return chat_sessions.stats()
+
+@router.get("/sessions/{session_id}")
+async def get_chat_session(session_id: str):
+    """Turn count, memory use and remaining idle time of one chat session"""
+    stats = chat_sessions.session_stats(session_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return stats
+
+# Counters the chat components already keep, read when /metrics is scraped
+registry.collector(
+    "chat_cache_lookups_total", "counter", "Chat answer cache lookups by result",
+    lambda: [({"result": result}, getattr(response_cache, result)) for result in ("hits", "near_hits", "misses")],
+)
+registry.collector(
+    "chat_cache_entries", "gauge", "Answers held in the chat cache",
+    lambda: [({}, response_cache.stats()["size"])],
+)
+registry.collector(
+    "chat_sessions", "gauge", "Live multi-turn chat sessions",
+    lambda: [({}, chat_sessions.stats()["sessions"])],
+)
+registry.collector(
+    "chat_session_memory_bytes", "gauge", "Estimated memory held by chat sessions",
+    lambda: [({}, chat_sessions.nbytes)],
+)
+registry.collector(
+    "chat_session_evictions_total", "counter", "Chat sessions dropped by reason",
+    lambda: [({"reason": reason}, count) for reason, count in chat_sessions.evictions.items()],
+)
+registry.collector(
+    "gemini_singleflight_calls_total", "counter", "Gemini calls started versus joined by identical questions",
+    lambda: [({"result": "started"}, gemini_flight.calls), ({"result": "coalesced"}, gemini_flight.coalesced)],
+)
+registry.collector(
+    "circuit_breaker_state", "gauge", "1 for the current state of each circuit breaker",
+    lambda: [
+        ({"name": gemini_breaker.name, "state": state}, 1 if gemini_breaker.stats()["state"] == state else 0)
+        for state in ("closed", "open", "half_open")
+    ],
+)
+registry.collector(
+    "circuit_breaker_short_circuited_total", "counter", "Calls rejected by an open circuit",
+    lambda: [({"name": gemini_breaker.name}, gemini_breaker.short_circuited)],
+)
+
+@router.get("/breaker")
+async def get_gemini_breaker_state():
+    """Gemini circuit breaker state, latency percentiles, timeout and recent transitions"""
+    return gemini_breaker.stats()
@@ -1,21 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from datetime import datetime
+from typing import Any, List
+import asyncio
 import os
-from dotenv import load_dotenv
 import logging
-import json
 from fastapi.responses import JSONResponse
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+from app.core.admission import contact_admission
+from app.core.clients import google_clients
+from app.core.config import settings
+from app.core.metrics import registry, sheets_append_duration, sheets_rows_appended
+from app.core.spool import WriteBehindSpool
+from app.utils.helpers import get_data_dir
 
-# Load environment variables
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -26,28 +26,52 @@ class ContactMessage(BaseModel):
     message: str
 
 # Google Sheets setup
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 SPREADSHEET_ID = os.getenv('GOOGLE_SHEET_ID')
 RANGE_NAME = 'Sheet1!A:E'  # Updated to include all columns
 
 def get_sheets_service():
     try:
-        # Get credentials from environment variable
-        creds_json = os.getenv('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-        if not creds_json:
-            raise ValueError("Google credentials not found in environment variables")
-        
-        creds_dict = json.loads(creds_json)
-        creds = service_account.Credentials.from_service_account_info(
-            creds_dict, scopes=SCOPES)
-        
-        # Build the Sheets API service
-        service = build('sheets', 'v4', credentials=creds)
-        return service
+        # Shared service; credentials and discovery are only built once per process
+        return google_clients.sheets()
     except Exception as e:
         logger.error(f"Error setting up Google Sheets service: {str(e)}")
         raise
 
+def append_rows_to_sheet(rows: List[List[Any]]):
+    """Append many rows to the sheet in a single API call"""
+    service = get_sheets_service()
+    with sheets_append_duration.time():
+        result = service.spreadsheets().values().append(
+            spreadsheetId=SPREADSHEET_ID,
+            range=RANGE_NAME,
+            valueInputOption='RAW',
+            insertDataOption='INSERT_ROWS',
+            body={'values': rows}
+        ).execute(http=google_clients.sheets_http())
+    sheets_rows_appended.inc(amount=len(rows))
+    logger.info(f"Messages saved to Google Sheets: {result}")
+    return result
+
+# Submissions are committed locally and written to Sheets in the background
+contact_spool = WriteBehindSpool(
+    settings.CONTACT_SPOOL_PATH or get_data_dir() / "contact_spool.sqlite3",
+    batch_size=settings.CONTACT_BATCH_SIZE,
+    flush_interval=settings.CONTACT_FLUSH_INTERVAL_SECONDS,
+    retry_base=settings.CONTACT_RETRY_BASE_SECONDS,
+    retry_max=settings.CONTACT_RETRY_MAX_SECONDS,
+)
+
+registry.collector(
+    "contact_spool_pending", "gauge", "Contact rows spooled locally and not yet in Google Sheets",
+    lambda: [({}, contact_spool.pending())],
+)
+
+async def start_contact_spool():
+    contact_spool.start(append_rows_to_sheet)
+
+async def stop_contact_spool():
+    await contact_spool.stop()
+
 @router.options("/submit")
 async def options_contact_form():
     return JSONResponse(
@@ -60,35 +84,33 @@ async def options_contact_form():
     )
 
 @router.post("/submit")
-async def submit_contact_form(contact_message: ContactMessage):
+async def submit_contact_form(contact_message: ContactMessage, request: Request):
+    contact_admission.check_rate(request)
+    with contact_admission.slot() as admitted:
+        if not admitted:
+            raise HTTPException(
+                status_code=429,
+                detail="The server is busy. Please try again shortly.",
+                headers={"Retry-After": "1"},
+            )
+        return await save_contact_message(contact_message)
+
+async def save_contact_message(contact_message: ContactMessage):
     try:
-        # Get the sheets service
-        service = get_sheets_service()
-        
         # Prepare the data
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        values = [[
+        values = [
             timestamp,
             contact_message.name,
             contact_message.email,
             contact_message.subject,
             contact_message.message
-        ]]
-        
-        body = {
-            'values': values
-        }
+        ]
         
-        # Append the data to the sheet
-        result = service.spreadsheets().values().append(
-            spreadsheetId=SPREADSHEET_ID,
-            range=RANGE_NAME,
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
+        # Durably spool the row; the background flusher appends it to the sheet
+        spool_id = await asyncio.to_thread(contact_spool.enqueue, values)
         
-        logger.info(f"Message saved to Google Sheets: {result}")
+        logger.info(f"Message spooled for Google Sheets: {spool_id}")
         return JSONResponse(
             content={"message": "Message sent successfully!"},
             headers={
@@ -99,7 +121,7 @@ async def submit_contact_form(contact_message: ContactMessage):
         )
         
     except Exception as e:
-        logger.error(f"Error saving message to Google Sheets: {str(e)}")
+        logger.error(f"Error spooling contact message: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="An error occurred while saving your message. Please try again later."
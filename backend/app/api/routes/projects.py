@@ -1,26 +1,98 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from typing import List, Literal, Optional
+from datetime import date
+import json
 
-from app.core.models import Project
-from app.utils.helpers import load_data_from_json, get_data_dir
+from app.core.models import Project, ProjectPage
+from app.core.project_query import SORT_FIELDS, InvalidCursor, decode_cursor, encode_cursor
+from app.core.repository import project_repository
+from app.utils.http_cache import response_cache
 
 router = APIRouter()
 
-# Project data (in a real app, this would come from a database)
-PROJECTS_FILE = get_data_dir() / "projects.json"
+# Projects are validated and encoded once when they are stored, so these
+# routes return the pre-encoded JSON directly; response_model only documents
+# the schema and is not re-validated per request.
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
 
 @router.get("/projects", response_model=List[Project], summary="Get all projects")
-async def get_projects():
+async def get_projects(request: Request):
     """
     Retrieve all projects.
     
     Returns:
         List of project objects
     """
-    projects = load_data_from_json(PROJECTS_FILE)
-    # Convert list of dictionaries to list of Project objects
-    return [Project(**project) for project in projects]
+    snapshot = project_repository.snapshot()
+    return response_cache.respond(
+        request, "projects", snapshot.version,
+        lambda: snapshot.body,
+    )
+
+@router.get("/projects/featured", response_model=List[Project], summary="Get featured projects")
+async def get_featured_projects():
+    """
+    Retrieve all featured projects.
+    
+    Returns:
+        List of featured project objects
+    """
+    return json_response(project_repository.featured_encoded())
 
+@router.get("/projects/search", response_model=ProjectPage, summary="Query projects")
+async def search_projects(
+    tech: List[str] = Query([], description="Tech stack entries to filter by, e.g. ?tech=Python&tech=Docker"),
+    tech_match: Literal["all", "any"] = Query("all", description="Require all or any of the given tech"),
+    featured: Optional[bool] = Query(None, description="Filter on the featured flag"),
+    date_from: Optional[date] = Query(None, alias="from", description="Projects still running on or after this date"),
+    date_to: Optional[date] = Query(None, alias="to", description="Projects started on or before this date"),
+    sort: Literal[SORT_FIELDS] = Query("id", description="Field to sort by"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    Filter, sort and paginate projects using the catalog's precomputed indexes.
+    
+    Returns:
+        A page of project objects with the total match count and a cursor
+        for the next page (null on the last page)
+        
+    Raises:
+        HTTPException: If the cursor is invalid or the date range is empty
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    try:
+        after = decode_cursor(cursor, sort) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    snapshot = project_repository.snapshot()
+    ids, total, next_key = snapshot.indexes["query"].query(
+        tech=tech,
+        match_all=tech_match == "all",
+        featured=featured,
+        date_from=date_from,
+        date_to=date_to,
+        sort=sort,
+        descending=order == "desc",
+        after=after,
+        limit=limit,
+    )
+    next_cursor = encode_cursor(sort, next_key) if next_key else None
+    # Same shape as ProjectPage, assembled from the pre-encoded projects
+    return json_response(
+        b'{"items":[' + b",".join(snapshot.encoded[project_id] for project_id in ids)
+        + b'],"total":' + str(total).encode()
+        + b',"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
+    )
+
+# Parameterized route last so it does not shadow the fixed paths above
 @router.get("/projects/{project_id}", response_model=Project, summary="Get project by ID")
 async def get_project(project_id: int):
     """
@@ -35,27 +107,12 @@ async def get_project(project_id: int):
     Raises:
         HTTPException: If project not found
     """
-    projects = load_data_from_json(PROJECTS_FILE)
-    for project in projects:
-        if project.get("id") == project_id:
-            return Project(**project)
-    
+    body = project_repository.get_encoded(project_id)
+    if body is not None:
+        return json_response(body)
+
     # If project not found, raise 404 error
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Project with ID {project_id} not found"
     )
-
-@router.get("/projects/featured", response_model=List[Project], summary="Get featured projects")
-async def get_featured_projects():
-    """
-    Retrieve all featured projects.
-    
-    Returns:
-        List of featured project objects
-    """
-    projects = load_data_from_json(PROJECTS_FILE)
-    featured_projects = [
-        Project(**project) for project in projects if project.get("is_featured", False)
-    ]
-    return featured_projects 
\ No newline at end of file
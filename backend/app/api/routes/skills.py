@@ -1,19 +1,20 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 
 from app.core.models import Skill
-from app.utils.helpers import load_data_from_json, get_data_dir
+from app.core.repository import skill_repository
+from app.utils.http_cache import response_cache
 
 router = APIRouter()
 
-# Define skills file path
-SKILLS_FILE = get_data_dir() / "skills.json"
-
 # Define a simple model for the categories response
 class SkillsDataResponse(BaseModel):
     categories: List[Dict[str, Any]]
 
+# Version tag for the static data below; it only changes on deploy
+STATIC_SKILLS_VERSION = "static"
+
 # Static skills data - this won't require loading from a JSON file
 SKILLS_DATA = {
     "categories": [
@@ -67,35 +68,57 @@ def get_all_skills_list():
 
 # First, define specific routes with fixed paths before the parameterized routes
 @router.get("/categories", response_model=SkillsDataResponse, summary="Get skills categories")
-async def get_skills_categories():
+async def get_skills_categories(request: Request):
     """Get skills grouped by category"""
     try:
-        return SKILLS_DATA
+        return response_cache.respond(
+            request, "skills_categories", STATIC_SKILLS_VERSION, lambda: SKILLS_DATA
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/all", response_model=List[dict], summary="Get all skills")
-async def get_skills():
+async def get_skills(
+    request: Request,
+    category: Optional[str] = Query(None, description="Only skills in this category"),
+    min_proficiency: Optional[int] = Query(None, ge=1, le=5, description="Only skills at or above this proficiency"),
+):
     """
-    Retrieve all skills.
+    Retrieve all skills, optionally filtered by category and proficiency.
     
     Returns:
         List of skill objects
     """
     try:
-        # Try loading from file first
-        if SKILLS_FILE.exists():
-            skills = load_data_from_json(str(SKILLS_FILE))
-            return skills
+        # Try the skills store first
+        snapshot = skill_repository.snapshot()
+        if category is not None or min_proficiency is not None:
+            if snapshot.exists:
+                # Filtered over the snapshot's indexes
+                return Response(
+                    content=skill_repository.filter_json(category, min_proficiency),
+                    media_type="application/json",
+                )
+            return [
+                skill for skill in get_all_skills_list()
+                if (category is None or skill["category"] == category)
+                and (min_proficiency is None or skill["proficiency"] >= min_proficiency)
+            ]
+        if snapshot.exists:
+            return response_cache.respond(
+                request, "skills_all", snapshot.version, lambda: snapshot.items
+            )
         else:
             # Fall back to static data
-            return get_all_skills_list()
+            return response_cache.respond(
+                request, "skills_all", STATIC_SKILLS_VERSION, get_all_skills_list
+            )
     except Exception as e:
         # Fall back to static data if there's an error
         return get_all_skills_list()
 
 @router.get("/by-category", response_model=Dict[str, List[dict]], summary="Get skills by category")
-async def get_skills_by_category():
+async def get_skills_by_category(request: Request):
     """
     Retrieve skills grouped by category.
     
@@ -103,28 +126,27 @@ async def get_skills_by_category():
         Dictionary with categories as keys and lists of skills as values
     """
     try:
-        # Try to load from file first
-        if SKILLS_FILE.exists():
-            skills = load_data_from_json(str(SKILLS_FILE))
-            
-            result = {}
-            for skill in skills:
-                category = skill.get("category", "Other")
-                if category not in result:
-                    result[category] = []
-                result[category].append(skill)
-            
-            return result
+        # Try the skills store first
+        snapshot = skill_repository.snapshot()
+        if snapshot.exists:
+            return response_cache.respond(
+                request, "skills_by_category", snapshot.version,
+                lambda: snapshot.indexes["by_category"],
+            )
         else:
             # Fall back to static data
-            result = {}
-            for skill in get_all_skills_list():
-                category = skill.get("category", "Other")
-                if category not in result:
-                    result[category] = []
-                result[category].append(skill)
-            
-            return result
+            def group_static_skills():
+                result = {}
+                for skill in get_all_skills_list():
+                    category = skill.get("category", "Other")
+                    if category not in result:
+                        result[category] = []
+                    result[category].append(skill)
+                return result
+
+            return response_cache.respond(
+                request, "skills_by_category", STATIC_SKILLS_VERSION, group_static_skills
+            )
     except Exception as e:
         # Fall back to static data if there's an error
         raise HTTPException(status_code=500, detail=str(e))
@@ -145,9 +167,11 @@ async def get_skill_by_id(skill_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("")
-async def get_all_skills():
+async def get_all_skills(request: Request):
     """Get all skills as a flat list"""
     try:
-        return get_all_skills_list()
+        return response_cache.respond(
+            request, "skills", STATIC_SKILLS_VERSION, get_all_skills_list
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
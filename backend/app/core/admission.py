@@ -0,0 +1,155 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+def client_key(request: Request) -> str:
+    """
+    Identify the client for rate limiting
+
+    With TRUST_FORWARDED_FOR set (the app runs behind FORWARDED_TRUSTED_HOPS
+    proxies, e.g. Render's), this is the X-Forwarded-For entry added by the
+    outermost trusted proxy, counted from the right: entries to the left of
+    it come from the client and could be anything. Otherwise it is the peer
+    address.
+    """
+    if settings.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            entries = [entry.strip() for entry in forwarded.split(",")]
+            hops = max(1, settings.FORWARDED_TRUSTED_HOPS)
+            return entries[max(0, len(entries) - hops)] or "unknown"
+    return request.client.host if request.client else "unknown"
+
+
+class TokenBucketLimiter:
+    """
+    Per-client token buckets.
+
+    Each client may spend ``burst`` requests at once and regains
+    ``rate_per_minute`` tokens per minute. Buckets are kept in LRU order
+    and capped at ``max_clients``; an evicted client simply starts again
+    with a full bucket.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, max_clients: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str) -> float:
+        """
+        Take a token for a client
+
+        Args:
+            key: Client identity
+
+        Returns:
+            0 if the request is allowed, else seconds until a token is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate if self.rate > 0 else 60.0
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionController:
+    """
+    Admission control for one expensive route: a per-client token bucket
+    plus a cap on requests in flight across all clients.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_in_flight: int):
+        self.name = name
+        self.limiter = TokenBucketLimiter(rate_per_minute, burst, settings.RATE_LIMIT_MAX_CLIENTS)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def check_rate(self, request: Request) -> None:
+        """
+        Enforce the per-client rate limit
+
+        Raises:
+            HTTPException: 429 with Retry-After if the client is over its rate
+        """
+        wait = self.limiter.acquire(client_key(request))
+        if wait > 0:
+            self.rate_limited += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please slow down.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    def try_enter(self) -> bool:
+        """Claim an in-flight slot; False means the route is saturated"""
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    @contextmanager
+    def slot(self) -> Iterator[bool]:
+        """Hold an in-flight slot for the block; yields False when saturated"""
+        admitted = self.try_enter()
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.leave()
+
+
+chat_admission = AdmissionController(
+    "chat",
+    rate_per_minute=settings.CHAT_RATE_PER_MINUTE,
+    burst=settings.CHAT_BURST,
+    max_in_flight=settings.CHAT_MAX_IN_FLIGHT,
+)
+
+contact_admission = AdmissionController(
+    "contact",
+    rate_per_minute=settings.CONTACT_RATE_PER_MINUTE,
+    burst=settings.CONTACT_BURST,
+    max_in_flight=settings.CONTACT_MAX_IN_FLIGHT,
+)
+
+registry.collector(
+    "admission_rejected_total", "counter", "Requests refused by admission control",
+    lambda: [
+        ({"route": controller.name, "reason": reason}, getattr(controller, reason))
+        for controller in (chat_admission, contact_admission)
+        for reason in ("rate_limited", "shed")
+    ],
+)
+registry.collector(
+    "admission_in_flight", "gauge", "Requests currently holding an in-flight slot",
+    lambda: [({"route": controller.name}, controller.in_flight) for controller in (chat_admission, contact_admission)],
+)
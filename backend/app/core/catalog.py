@@ -0,0 +1,402 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.project_query import ProjectQueryIndex
+from app.core.shared_snapshot import MappedSnapshot, exclusive_lock, read_snapshot, write_snapshot
+from app.core.storage import CatalogStore, catalog_store, encode_fragment, normalize_items
+from app.utils.helpers import get_data_dir
+from app.utils.singleflight import ThreadSingleFlight
+
+logger = logging.getLogger(__name__)
+
+# (inode, mtime in ns, size) of the file a snapshot was built from, or any
+# other hashable value identifying the source version
+FileSignature = Tuple[Any, ...]
+IndexBuilder = Callable[[List[Dict[str, Any]]], Any]
+
+
+class CatalogSnapshot:
+    """
+    Immutable, fully indexed view of a catalog file at one version.
+
+    ``body`` is the JSON array of every item and ``encoded`` maps each id
+    to that item's slice of it (as the model serializes it, for catalogs
+    with a model), so responses are assembled from bytes without
+    validating or encoding anything per request. The body is either held
+    in memory or mapped from a snapshot file shared by all workers. The
+    parsed items, ``by_id`` and the indexes are built on first use, so a
+    worker that only serves pre-encoded bytes never parses the catalog.
+    """
+
+    __slots__ = (
+        "signature", "version", "body", "encoded",
+        "_load_items", "_index_builders", "_items", "_by_id", "_indexes", "_lock",
+    )
+
+    def __init__(
+        self,
+        signature: Optional[FileSignature],
+        version: str,
+        load_items: Callable[[], List[Dict[str, Any]]],
+        index_builders: Dict[str, IndexBuilder],
+        body: Any = b"[]",
+        spans: Optional[List[Tuple[Any, int, int]]] = None,
+    ):
+        self.signature = signature
+        self.version = version
+        self.body = body
+        view = memoryview(body)
+        self.encoded = {item_id: view[start:end] for item_id, start, end in spans or []}
+        self._load_items = load_items
+        self._index_builders = index_builders
+        self._items: Optional[List[Dict[str, Any]]] = None
+        self._by_id: Optional[Dict[Any, Dict[str, Any]]] = None
+        self._indexes: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        if self._items is None:
+            with self._lock:
+                if self._items is None:
+                    self._items = self._load_items()
+        return self._items
+
+    @property
+    def by_id(self) -> Dict[Any, Dict[str, Any]]:
+        if self._by_id is None:
+            self._by_id = {item["id"]: item for item in self.items if "id" in item}
+        return self._by_id
+
+    @property
+    def indexes(self) -> Dict[str, Any]:
+        if self._indexes is None:
+            items = self.items
+            with self._lock:
+                if self._indexes is None:
+                    self._indexes = {name: build(items) for name, build in self._index_builders.items()}
+        return self._indexes
+
+    def encode_list(self, items: List[Dict[str, Any]]) -> bytes:
+        """JSON array of the given items from their pre-encoded fragments"""
+        return b"[" + b",".join(self.encoded[item["id"]] for item in items) + b"]"
+
+    @property
+    def exists(self) -> bool:
+        """Whether the snapshot was loaded from an existing source"""
+        return self.signature is not None
+
+
+class WatchedFile(ABC):
+    """
+    Base for process-wide, in-memory views of a file on disk.
+
+    Subclasses turn the file into a snapshot object in ``_build``; the
+    snapshot is kept until the file's inode, mtime or size changes. Every
+    access costs a single ``os.stat``. Concurrent callers that see the same
+    new file version share one reload through a single-flight, including
+    when the reload fails, so a burst of cold requests parses the file
+    once. The rebuilt snapshot is swapped in with one reference assignment,
+    so readers never see a half-built one. Snapshots must expose the
+    ``signature`` they were built from.
+    """
+
+    def __init__(self, file_path: Path, name: Optional[str] = None):
+        self.file_path = Path(file_path)
+        self.name = name or self.file_path.name
+        self._snapshot: Optional[Any] = None
+        self._loads = ThreadSingleFlight()
+
+    def _stat(self) -> Optional[FileSignature]:
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    @abstractmethod
+    def _build(self, signature: Optional[FileSignature]) -> Any:
+        """Snapshot of the file at the given version"""
+
+    @abstractmethod
+    def _empty(self) -> Any:
+        """Snapshot to serve when the first load fails"""
+
+    def _reload(self, signature: Optional[FileSignature]) -> Any:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+        try:
+            snapshot = self._build(signature)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            # A file caught mid-write is not worth dropping good data for;
+            # keep serving the previous version and retry on the next access.
+            logger.error(f"Error loading {self.name}: {e}")
+            if self._snapshot is not None:
+                return self._snapshot
+            return self._empty()
+        self._snapshot = snapshot
+        logger.info(f"Loaded {self.name} version {snapshot.version}")
+        return snapshot
+
+    def get(self) -> Any:
+        """
+        Get the current snapshot, reloading it if the file changed
+
+        Returns:
+            The latest snapshot
+        """
+        signature = self._stat()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.signature == signature:
+            return snapshot
+        return self._loads.do(signature, lambda: self._reload(signature))
+
+
+class JsonCatalog(WatchedFile):
+    """
+    Process-wide store for a JSON list file.
+
+    The file is parsed once and kept in memory together with an id-keyed
+    dict and any extra indexes, and rebuilt when the file changes. With a
+    ``model``, every item is validated once at load time; a file with an
+    invalid item is rejected like a malformed one. Items are kept in their
+    normalized JSON form (defaults filled in, extra keys preserved) and
+    each one is also pre-encoded as the model serializes it.
+
+    With a ``snapshot_dir`` (multi-worker serving), the encoded catalog is
+    published there as a snapshot file and memory-mapped, so all workers
+    share one copy. The first worker to see a new version of the source
+    file builds the snapshot under an inter-process lock and renames it
+    into place; the others map the finished file instead of rebuilding.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        index_builders: Optional[Dict[str, IndexBuilder]] = None,
+        model: Optional[Type[BaseModel]] = None,
+        snapshot_dir: Optional[Path] = None,
+        name: Optional[str] = None,
+    ):
+        super().__init__(file_path, name)
+        self._index_builders = index_builders or {}
+        self._model = model
+        stem = Path(self.name).stem
+        self.snapshot_path = Path(snapshot_dir) / f"{stem}.snapshot" if snapshot_dir else None
+
+    def _load(self, signature: Optional[FileSignature]) -> Tuple[str, List[Dict[str, Any]], List[bytes]]:
+        """Read and validate the source: (version, items, encoded items)"""
+        if signature is None:
+            return hashlib.sha256(b"[]").hexdigest()[:16], [], []
+        with open(self.file_path, "rb") as f:
+            raw = f.read()
+        items = json.loads(raw)
+        if not isinstance(items, list):
+            raise ValueError(f"{self.file_path} must contain a JSON list")
+        items, fragments = normalize_items(self._model, items, self.name)
+        return hashlib.sha256(raw).hexdigest()[:16], items, fragments
+
+    def _encode(self, signature: Optional[FileSignature]) -> Tuple[str, List[Dict[str, Any]], bytes, List[Tuple[Any, int, int]]]:
+        """Load and encode the source: (version, items, body, spans)"""
+        version, items, fragments = self._load(signature)
+        spans = []
+        offset = 1
+        for item, fragment in zip(items, fragments):
+            if isinstance(item, dict) and "id" in item:
+                spans.append((item["id"], offset, offset + len(fragment)))
+            offset += len(fragment) + 1
+        body = b"[" + b",".join(fragments) + b"]"
+        return version, items, body, spans
+
+    def _build(self, signature: Optional[FileSignature]) -> CatalogSnapshot:
+        if self.snapshot_path is None or signature is None:
+            version, items, body, spans = self._encode(signature)
+            return CatalogSnapshot(signature, version, lambda: items, self._index_builders, body, spans)
+
+        with exclusive_lock(self.snapshot_path):
+            mapped = read_snapshot(self.snapshot_path)
+            if mapped is not None and mapped.header.get("source") == list(signature):
+                return self._from_mapped(signature, mapped)
+
+            version, items, body, spans = self._encode(signature)
+            items_json = encode_fragment(items)
+            header = {
+                "source": list(signature),
+                "version": version,
+                "spans": spans,
+                "items": [len(body), len(body) + len(items_json)],
+            }
+            write_snapshot(self.snapshot_path, header, body + items_json)
+            logger.info(f"Published shared snapshot {self.snapshot_path.name} version {version}")
+            mapped = read_snapshot(self.snapshot_path)
+        # This process already has the parsed items; other workers parse them from the map on demand
+        snapshot = self._from_mapped(signature, mapped)
+        snapshot._items = items
+        return snapshot
+
+    def _from_mapped(self, signature: FileSignature, mapped: MappedSnapshot) -> CatalogSnapshot:
+        header = mapped.header
+        items_start, items_end = header["items"]
+        blob = mapped.blob
+
+        def load_items() -> List[Dict[str, Any]]:
+            return json.loads(bytes(blob[items_start:items_end]))
+
+        return CatalogSnapshot(
+            signature, header["version"], load_items, self._index_builders,
+            blob[:items_start], [tuple(span) for span in header["spans"]],
+        )
+
+    def _empty(self) -> CatalogSnapshot:
+        return CatalogSnapshot(None, "empty", lambda: [], self._index_builders)
+
+    def get(self) -> CatalogSnapshot:
+        """Get the current catalog snapshot, reloading it if the file changed"""
+        return super().get()
+
+
+class StoredCatalog(JsonCatalog):
+    """
+    Catalog snapshots of a table in the SQLite catalog store.
+
+    Items were validated when they were written, so a rebuild only reads
+    the stored rows and their encoded JSON. Checking for a new version
+    reads the store and stats the catalog's JSON file, re-importing an
+    edited file (see ``CatalogStore.sync_json``), so it is kept out of
+    ``get``: once a snapshot is loaded, ``get`` only returns it. The check
+    is ``refresh``, which the CatalogPoller runs on a worker thread every
+    few seconds, so a write made by any process is served shortly after.
+    """
+
+    def __init__(
+        self,
+        store: CatalogStore,
+        name: str,
+        index_builders: Optional[Dict[str, IndexBuilder]] = None,
+        snapshot_dir: Optional[Path] = None,
+    ):
+        super().__init__(store.path, index_builders, snapshot_dir=snapshot_dir, name=name)
+        self.store = store
+
+    def _stat(self) -> Optional[FileSignature]:
+        self.store.sync_json(self.name)
+        return self.store.version(self.name)
+
+    def get(self) -> CatalogSnapshot:
+        """Get the current catalog snapshot (loading it on first use only)"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        return self.refresh()
+
+    def refresh(self) -> CatalogSnapshot:
+        """
+        Check the store (and the JSON file) for a new version and load it
+
+        Blocks on SQLite and file I/O; async code runs it in a thread.
+
+        Returns:
+            The latest snapshot
+        """
+        return super().get()
+
+    def _load(self, signature: Optional[FileSignature]) -> Tuple[str, List[Dict[str, Any]], List[bytes]]:
+        if signature is None:
+            return hashlib.sha256(b"[]").hexdigest()[:16], [], []
+        version, items, fragments = self.store.rows(self.name)
+        if version != signature:
+            # Written again since the version check; the next access picks that up
+            raise ValueError(f"{self.name} changed while loading")
+        digest = hashlib.sha256()
+        for fragment in fragments:
+            digest.update(fragment)
+        return digest.hexdigest()[:16], items, fragments
+
+
+def _featured_projects(projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [project for project in projects if project.get("is_featured", False)]
+
+
+def _skills_by_category(skills: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    for skill in skills:
+        result.setdefault(skill.get("category", "Other"), []).append(skill)
+    return result
+
+
+class CatalogPoller:
+    """
+    Keeps stored catalogs current from a background task.
+
+    ``start`` loads every catalog, then refreshes them every ``interval``
+    seconds until ``stop``. Each refresh runs in a worker thread, so the
+    event loop never waits on SQLite or on a re-import.
+    """
+
+    def __init__(self, catalogs: List[StoredCatalog], interval: float):
+        self.catalogs = catalogs
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self, name: Optional[str] = None) -> None:
+        """Refresh the named catalog, or all of them, off the event loop"""
+        for catalog in self.catalogs:
+            if name is not None and catalog.name != name:
+                continue
+            try:
+                await asyncio.to_thread(catalog.refresh)
+            except Exception as e:
+                # The current snapshot stays in use; the next round tries again
+                logger.error(f"Error refreshing {catalog.name}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    async def start(self) -> None:
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# With several workers the encoded catalogs are shared through memory-mapped snapshot files
+SNAPSHOT_DIR = (
+    Path(settings.CATALOG_SNAPSHOT_DIR or get_data_dir() / "snapshots") if settings.SHARED_CATALOG else None
+)
+
+projects_catalog = StoredCatalog(
+    catalog_store,
+    "projects",
+    index_builders={"featured": _featured_projects, "query": ProjectQueryIndex},
+    snapshot_dir=SNAPSHOT_DIR,
+)
+
+skills_catalog = StoredCatalog(
+    catalog_store,
+    "skills",
+    index_builders={"by_category": _skills_by_category},
+    snapshot_dir=SNAPSHOT_DIR,
+)
+
+catalog_poller = CatalogPoller([projects_catalog, skills_catalog], settings.CATALOG_REFRESH_SECONDS)
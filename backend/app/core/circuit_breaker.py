@@ -0,0 +1,229 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class _Call:
+    __slots__ = ("latency", "succeeded_flag")
+
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.succeeded_flag = False
+
+    def succeeded(self, latency: Optional[float] = None) -> None:
+        """Mark the guarded call successful, with its latency if it is comparable"""
+        self.succeeded_flag = True
+        self.latency = latency
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with a latency-derived timeout for one upstream.
+
+    Outcomes of the last ``window`` calls are kept. Once at least
+    ``min_calls`` are recorded and the failure rate reaches
+    ``failure_rate``, the circuit opens and calls fail fast with
+    CircuitOpenError. After ``cooldown`` seconds it goes half-open and
+    lets up to ``probes`` calls through; that many successes close it,
+    any failure opens it again.
+
+    ``timeout()`` is the observed p99 latency of successful calls times
+    ``timeout_multiplier``, clamped to [min_timeout, max_timeout], and
+    max_timeout until ``min_calls`` latencies are known.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 50,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        cooldown: float = 30.0,
+        probes: int = 2,
+        min_timeout: float = 3.0,
+        max_timeout: float = 15.0,
+        timeout_multiplier: float = 1.5,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.probes = probes
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._sorted_latencies: Optional[List[float]] = None
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self.transitions: Deque[Dict[str, Any]] = deque(maxlen=20)
+        self.short_circuited = 0
+
+    def _transition(self, state: str, reason: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"Circuit {self.name}: {self.state} -> {state} ({reason})")
+        self.transitions.append({"from": self.state, "to": state, "at": time.time(), "reason": reason})
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def is_open(self) -> bool:
+        """True while calls should fail fast (open and still cooling down)"""
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.cooldown
+
+    def check(self) -> None:
+        """
+        Fail fast before doing any work for a call
+
+        Raises:
+            CircuitOpenError: If the circuit is open and cooling down
+        """
+        if self.is_open():
+            self.short_circuited += 1
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    return False
+                self._transition(HALF_OPEN, "cooldown elapsed")
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def _record(self, probe: bool, success: Optional[bool], latency: Optional[float]) -> None:
+        with self._lock:
+            if probe and self.state == HALF_OPEN:
+                self._probes_in_flight -= 1
+            if success is None:
+                return
+            if success and latency is not None:
+                self._latencies.append(latency)
+                self._sorted_latencies = None
+
+            if self.state == HALF_OPEN:
+                if not success:
+                    self._transition(OPEN, "probe failed")
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.probes:
+                        self._transition(CLOSED, f"{self.probes} probes succeeded")
+                return
+
+            self._outcomes.append(success)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                    and self._failure_rate() >= self.failure_rate):
+                self._transition(OPEN, f"failure rate {self._failure_rate():.0%}")
+
+    @contextmanager
+    def guard(self) -> Iterator[_Call]:
+        """
+        Guard one upstream call
+
+        Exceptions raised in the block count as failures; call
+        ``.succeeded(latency)`` on the yielded object when the call worked.
+        A cancelled block records nothing.
+
+        Raises:
+            CircuitOpenError: If the circuit does not admit the call
+        """
+        if not self._admit():
+            self.short_circuited += 1
+            raise CircuitOpenError(f"Circuit {self.name} is {self.state}")
+        probe = self.state == HALF_OPEN
+        call = _Call()
+        try:
+            yield call
+        except Exception:
+            self._record(probe, False, None)
+            raise
+        except BaseException:
+            self._record(probe, None, None)
+            raise
+        else:
+            self._record(probe, True if call.succeeded_flag else None, call.latency)
+
+    def _latency_percentiles(self) -> List[float]:
+        ordered = self._sorted_latencies
+        if ordered is None:
+            ordered = self._sorted_latencies = sorted(self._latencies)
+        return ordered
+
+    def timeout(self) -> float:
+        """Current per-call timeout derived from observed latency"""
+        ordered = self._latency_percentiles()
+        if len(ordered) < self.min_calls:
+            return self.max_timeout
+        adaptive = percentile(ordered, 0.99) * self.timeout_multiplier
+        return min(self.max_timeout, max(self.min_timeout, adaptive))
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state, recent failure rate, latency percentiles and transitions"""
+        ordered = self._latency_percentiles()
+        return {
+            "name": self.name,
+            "state": OPEN if self.is_open() else (HALF_OPEN if self.state == OPEN else self.state),
+            "failure_rate": round(self._failure_rate(), 4),
+            "window_calls": len(self._outcomes),
+            "latency_p50": round(percentile(ordered, 0.50), 4),
+            "latency_p95": round(percentile(ordered, 0.95), 4),
+            "latency_p99": round(percentile(ordered, 0.99), 4),
+            "timeout": round(self.timeout(), 4),
+            "short_circuited": self.short_circuited,
+            "transitions": list(self.transitions),
+        }
+
+
+gemini_breaker = CircuitBreaker(
+    "gemini",
+    window=settings.GEMINI_BREAKER_WINDOW,
+    min_calls=settings.GEMINI_BREAKER_MIN_CALLS,
+    failure_rate=settings.GEMINI_BREAKER_FAILURE_RATE,
+    cooldown=settings.GEMINI_BREAKER_COOLDOWN_SECONDS,
+    probes=settings.GEMINI_BREAKER_PROBES,
+    min_timeout=settings.GEMINI_MIN_TIMEOUT_SECONDS,
+    max_timeout=settings.GEMINI_TIMEOUT_SECONDS,
+    timeout_multiplier=settings.GEMINI_TIMEOUT_MULTIPLIER,
+)
@@ -0,0 +1,150 @@
+import datetime
+import json
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import google_auth_httplib2
+    from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+# Refresh access tokens this long before they expire
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+
+
+class GoogleClients:
+    """
+    Process-wide Google API clients.
+
+    Service-account credentials and the Sheets service (discovery document
+    and resource tree) are built once and shared. httplib2 connections are
+    not thread-safe, so each thread gets its own keep-alive AuthorizedHttp
+    over the shared credentials; token refreshes go through one pooled
+    requests.Session under a lock and happen before the token expires
+    rather than on a 401.
+
+    The Google SDKs take about a second to import, so they are imported on
+    first use rather than with the app; ``warm_up()`` does that in the
+    background once the server is up. The Sheets service is built from the
+    discovery document bundled with google-api-python-client, so building
+    it needs no network.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._credentials: Optional[service_account.Credentials] = None
+        self._sheets = None
+        self._auth_request = None
+        self._gemini_model = None
+        self._gemini_configured = False
+
+    def credentials(self) -> "service_account.Credentials":
+        """
+        Get the shared service-account credentials with a fresh token
+
+        Raises:
+            ValueError: If GOOGLE_APPLICATION_CREDENTIALS_JSON is not set
+        """
+        with self._lock:
+            if self._credentials is None:
+                creds_json = os.getenv('GOOGLE_APPLICATION_CREDENTIALS_JSON')
+                if not creds_json:
+                    raise ValueError("Google credentials not found in environment variables")
+                import requests
+                from google.auth.transport.requests import Request as AuthRequest
+                from google.oauth2 import service_account
+
+                self._auth_request = AuthRequest(session=requests.Session())
+                self._credentials = service_account.Credentials.from_service_account_info(
+                    json.loads(creds_json), scopes=SHEETS_SCOPES)
+            creds = self._credentials
+            # google-auth stores expiry as naive UTC
+            now = datetime.datetime.utcnow()
+            if not creds.valid or creds.expiry is None or creds.expiry - now < TOKEN_REFRESH_MARGIN:
+                creds.refresh(self._auth_request)
+                logger.info(f"Refreshed Google access token, expires {creds.expiry}")
+            return creds
+
+    def sheets_http(self) -> "google_auth_httplib2.AuthorizedHttp":
+        """Keep-alive authorized HTTP transport for the calling thread"""
+        creds = self.credentials()
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import google_auth_httplib2
+            import httplib2
+
+            http = google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http(timeout=30))
+            self._local.http = http
+        return http
+
+    def sheets(self) -> Any:
+        """
+        Get the shared Sheets v4 service
+
+        Requests built from it should be executed with
+        ``.execute(http=google_clients.sheets_http())``.
+        """
+        if self._sheets is None:
+            http = self.sheets_http()
+            with self._lock:
+                if self._sheets is None:
+                    from googleapiclient.discovery import build
+
+                    self._sheets = build('sheets', 'v4', http=http, cache_discovery=False, static_discovery=True)
+                    logger.info("Google Sheets service initialized")
+        return self._sheets
+
+    @property
+    def gemini_enabled(self) -> bool:
+        """Whether a Gemini API key is configured; does not import the SDK"""
+        return bool(os.getenv('GEMINI_API_KEY'))
+
+    @property
+    def gemini_loaded(self) -> bool:
+        """Whether gemini_model() has run, so calling it will not block on the import"""
+        return self._gemini_configured
+
+    def gemini_model(self) -> Optional[Any]:
+        """
+        Get the shared Gemini model, or None when GEMINI_API_KEY is not configured
+
+        The first call imports google.generativeai, which blocks for about a
+        second; call it from a worker thread when gemini_loaded is False.
+        """
+        if self._gemini_configured:
+            return self._gemini_model
+        with self._lock:
+            if not self._gemini_configured:
+                try:
+                    api_key = os.getenv('GEMINI_API_KEY')
+                    if api_key:
+                        import google.generativeai as genai
+
+                        genai.configure(api_key=api_key)
+                        self._gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+                        logger.info("Gemini API initialized successfully")
+                    else:
+                        logger.warning("GEMINI_API_KEY not found in environment variables")
+                except Exception as e:
+                    logger.error(f"Error initializing Gemini API: {str(e)}")
+                self._gemini_configured = True
+            return self._gemini_model
+
+    def warm_up(self) -> None:
+        """Import the SDKs and build the clients that are configured, ahead of the first request"""
+        self.gemini_model()
+        if os.getenv('GOOGLE_APPLICATION_CREDENTIALS_JSON'):
+            try:
+                self.sheets()
+            except Exception as e:
+                logger.error(f"Error warming up Google Sheets client: {str(e)}")
+
+
+google_clients = GoogleClients()
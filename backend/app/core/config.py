@@ -20,5 +20,98 @@ class Settings(BaseModel):
     EMAILS_FROM_EMAIL: str = os.getenv("EMAILS_FROM_EMAIL", "")
     EMAILS_TO_EMAIL: str = os.getenv("EMAILS_TO_EMAIL", "")
 
+    # Serving (gunicorn.conf.py): worker processes, and whether the app is imported
+    # once in the master before forking so workers share its memory
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    PRELOAD_APP: bool = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+    # SQLite database holding the projects and skills catalogs ("" keeps it in
+    # data/catalog.sqlite3); it is seeded from the JSON files on first use. Each
+    # worker checks it (and the JSON files) for changes every CATALOG_REFRESH_SECONDS
+    CATALOG_DB_PATH: str = os.getenv("CATALOG_DB_PATH", "")
+    CATALOG_REFRESH_SECONDS: float = float(os.getenv("CATALOG_REFRESH_SECONDS", "1"))
+
+    # Admin API (catalog bulk import, batch chat): bearer token ("" disables it),
+    # longest accepted NDJSON import line and import rows staged per write
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    IMPORT_MAX_LINE_BYTES: int = int(os.getenv("IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+    # Share encoded catalogs between workers through memory-mapped snapshot files
+    # (on by default with more than one worker); "" keeps them in data/snapshots
+    SHARED_CATALOG: bool = os.getenv("SHARED_CATALOG", str(WEB_CONCURRENCY > 1)).lower() == "true"
+    CATALOG_SNAPSHOT_DIR: str = os.getenv("CATALOG_SNAPSHOT_DIR", "")
+
+    # HTTP caching for read-only catalog endpoints (seconds before revalidation)
+    CACHE_MAX_AGE: int = int(os.getenv("CACHE_MAX_AGE", "60"))
+
+    # Gemini chat: max concurrent upstream calls and per-request deadline (seconds)
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+    GEMINI_TIMEOUT_SECONDS: float = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "15"))
+
+    # Batch chat (POST /api/chatbot/chat/batch): messages per request, and messages
+    # answered at once across all batches (kept below GEMINI_MAX_CONCURRENCY so live
+    # chat always has a Gemini slot); the default leaves half of the slots to live chat
+    CHAT_BATCH_MAX_MESSAGES: int = int(os.getenv("CHAT_BATCH_MAX_MESSAGES", "1000"))
+    CHAT_BATCH_CONCURRENCY: int = int(os.getenv("CHAT_BATCH_CONCURRENCY", str(max(1, GEMINI_MAX_CONCURRENCY // 2))))
+
+    # Gemini circuit breaker: opens when the failure rate over the last WINDOW calls
+    # reaches FAILURE_RATE (after MIN_CALLS), retries with PROBES calls after COOLDOWN
+    GEMINI_BREAKER_WINDOW: int = int(os.getenv("GEMINI_BREAKER_WINDOW", "50"))
+    GEMINI_BREAKER_MIN_CALLS: int = int(os.getenv("GEMINI_BREAKER_MIN_CALLS", "10"))
+    GEMINI_BREAKER_FAILURE_RATE: float = float(os.getenv("GEMINI_BREAKER_FAILURE_RATE", "0.5"))
+    GEMINI_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("GEMINI_BREAKER_COOLDOWN_SECONDS", "30"))
+    GEMINI_BREAKER_PROBES: int = int(os.getenv("GEMINI_BREAKER_PROBES", "2"))
+
+    # Adaptive Gemini timeout: observed p99 latency x MULTIPLIER, never below MIN
+    # nor above GEMINI_TIMEOUT_SECONDS
+    GEMINI_MIN_TIMEOUT_SECONDS: float = float(os.getenv("GEMINI_MIN_TIMEOUT_SECONDS", "3"))
+    GEMINI_TIMEOUT_MULTIPLIER: float = float(os.getenv("GEMINI_TIMEOUT_MULTIPLIER", "1.5"))
+
+    # Chat answer cache keyed by normalized question; similarity 0 disables near-duplicate hits
+    CHAT_CACHE_TTL_SECONDS: float = float(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+    CHAT_CACHE_MAX_ENTRIES: int = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "512"))
+    CHAT_CACHE_SIMILARITY: float = float(os.getenv("CHAT_CACHE_SIMILARITY", "0.75"))
+
+    # Multi-turn chat sessions (opt-in: a client sends session_id "new"): idle expiry,
+    # caps on sessions and total memory, turns kept per session (each side cut to
+    # MAX_TURN_CHARS) and history tokens per prompt
+    CHAT_SESSION_TTL_SECONDS: float = float(os.getenv("CHAT_SESSION_TTL_SECONDS", "1800"))
+    CHAT_SESSION_MAX_SESSIONS: int = int(os.getenv("CHAT_SESSION_MAX_SESSIONS", "5000"))
+    CHAT_SESSION_MAX_MEMORY_MB: float = float(os.getenv("CHAT_SESSION_MAX_MEMORY_MB", "16"))
+    CHAT_SESSION_MAX_TURNS: int = int(os.getenv("CHAT_SESSION_MAX_TURNS", "8"))
+    CHAT_SESSION_MAX_TURN_CHARS: int = int(os.getenv("CHAT_SESSION_MAX_TURN_CHARS", "2000"))
+    CHAT_SESSION_HISTORY_TOKENS: int = int(os.getenv("CHAT_SESSION_HISTORY_TOKENS", "600"))
+
+    # Local retrieval: send only the top-k context chunks to Gemini, and answer
+    # directly from a chunk only when the question names it (a term no other chunk
+    # has), it covers at least CONFIDENCE of the question and it outscores the
+    # runner-up by MARGIN times
+    RETRIEVAL_ENABLED: bool = os.getenv("RETRIEVAL_ENABLED", "true").lower() == "true"
+    RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+    RETRIEVAL_DIRECT_ANSWER_CONFIDENCE: float = float(os.getenv("RETRIEVAL_DIRECT_ANSWER_CONFIDENCE", "0.85"))
+    RETRIEVAL_DIRECT_ANSWER_MARGIN: float = float(os.getenv("RETRIEVAL_DIRECT_ANSWER_MARGIN", "2"))
+
+    # Contact form write-behind spool flushed to Google Sheets in batches
+    CONTACT_SPOOL_PATH: str = os.getenv("CONTACT_SPOOL_PATH", "")  # defaults to data/contact_spool.sqlite3
+    CONTACT_BATCH_SIZE: int = int(os.getenv("CONTACT_BATCH_SIZE", "50"))
+    CONTACT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("CONTACT_FLUSH_INTERVAL_SECONDS", "2"))
+    CONTACT_RETRY_BASE_SECONDS: float = float(os.getenv("CONTACT_RETRY_BASE_SECONDS", "2"))
+    CONTACT_RETRY_MAX_SECONDS: float = float(os.getenv("CONTACT_RETRY_MAX_SECONDS", "300"))
+
+    # Admission control for the expensive routes: per-client token bucket
+    # (requests per minute + burst) and a global cap on requests in flight.
+    # Behind proxies, TRUST_FORWARDED_FOR keys clients by the X-Forwarded-For
+    # entry the outermost of FORWARDED_TRUSTED_HOPS proxies appended
+    TRUST_FORWARDED_FOR: bool = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+    FORWARDED_TRUSTED_HOPS: int = int(os.getenv("FORWARDED_TRUSTED_HOPS", "1"))
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+    CHAT_RATE_PER_MINUTE: float = float(os.getenv("CHAT_RATE_PER_MINUTE", "20"))
+    CHAT_BURST: int = int(os.getenv("CHAT_BURST", "5"))
+    CHAT_MAX_IN_FLIGHT: int = int(os.getenv("CHAT_MAX_IN_FLIGHT", "32"))
+    CONTACT_RATE_PER_MINUTE: float = float(os.getenv("CONTACT_RATE_PER_MINUTE", "5"))
+    CONTACT_BURST: int = int(os.getenv("CONTACT_BURST", "3"))
+    CONTACT_MAX_IN_FLIGHT: int = int(os.getenv("CONTACT_MAX_IN_FLIGHT", "16"))
+
 # Instantiate the settings object
 settings = Settings() 
\ No newline at end of file
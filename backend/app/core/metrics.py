@@ -0,0 +1,272 @@
+import asyncio
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, from fast cached reads up to LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets, optionally split by labels.
+
+    Observing a value is a bisect over the bucket bounds plus two
+    additions under a lock, so it costs well under a microsecond.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last)], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def time(self, *labels: str) -> "OutcomeTimer":
+        """Observe the duration of a block, with its outcome appended to the labels"""
+        return OutcomeTimer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class OutcomeTimer:
+    """
+    Times a block and observes it with a trailing "outcome" label: "ok",
+    "timeout", "error", or "cancelled" when the task was cancelled.
+    ``elapsed`` holds the duration once the block exits.
+    """
+
+    __slots__ = ("histogram", "labels", "started", "elapsed")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self.histogram = histogram
+        self.labels = labels
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "OutcomeTimer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.elapsed = time.perf_counter() - self.started
+        if exc_type is None:
+            outcome = "ok"
+        elif issubclass(exc_type, (asyncio.TimeoutError, TimeoutError)):
+            outcome = "timeout"
+        elif issubclass(exc_type, Exception):
+            outcome = "error"
+        else:
+            outcome = "cancelled"
+        self.histogram.observe(self.elapsed, *self.labels, outcome)
+
+
+# A gauge or counter read from existing state when /metrics is scraped:
+# (name, type, help, callable returning [(label dict, value)])
+Collector = Tuple[str, str, str, Callable[[], Iterable[Tuple[Dict[str, str], float]]]]
+
+
+class MetricsRegistry:
+    """
+    Metrics exposed in the Prometheus text format.
+
+    Counters and histograms are updated on the hot path; collectors read
+    numbers other components already keep (cache hit counts, breaker state)
+    only when the endpoint is scraped, so they cost nothing per request.
+    """
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(
+        self,
+        name: str,
+        kind: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[Dict[str, str], float]]],
+    ) -> None:
+        """Register a metric whose samples are computed at scrape time"""
+        self._collectors.append((name, kind, documentation, collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, kind, documentation, collect in self._collectors:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in collect():
+                lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+gemini_duration = registry.histogram(
+    "gemini_request_duration_seconds", "Gemini upstream call latency", ("mode", "outcome")
+)
+sheets_append_duration = registry.histogram(
+    "sheets_append_duration_seconds", "Google Sheets append call latency", ("outcome",)
+)
+sheets_rows_appended = registry.counter(
+    "sheets_rows_appended_total", "Contact rows written to Google Sheets"
+)
+chat_fallbacks = registry.counter(
+    "chat_fallback_responses_total", "Chat answers served by the keyword fallback", ("reason",)
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled a request, e.g.
+    ``/api/projects/projects/{project_id}``, or "unmatched"
+
+    Some FastAPI versions report routes of an included router relative to
+    its prefix; the prefix is then restored from the request path, which
+    has the same number of segments as the template.
+    """
+    template: Optional[str] = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    depth = template.count("/")
+    if not depth:
+        return scope["path"]
+    segments = scope["path"].split("/")
+    return "/".join(segments[:len(segments) - depth]) + template
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count, status and latency per route.
+
+    Requests are labelled with the matched route template (e.g.
+    ``/api/projects/{project_id}``) so ids do not create new series;
+    requests that match no route share the label "unmatched". Latency runs
+    until the last body chunk is sent, which covers streamed responses.
+    """
+
+    def __init__(self, app: ASGIApp, exclude: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            template = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, template, str(status_code))
+            http_request_duration.observe(time.perf_counter() - started, method, template)
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, EmailStr, HttpUrl, Field
 from datetime import date
 
@@ -18,6 +18,20 @@ class Project(ProjectBase):
     """Complete Project model with ID"""
     id: int
 
+class ProjectPage(BaseModel):
+    """One page of a project query"""
+    items: List[Project]
+    total: int
+    next_cursor: Optional[str] = None
+
+class BootstrapPayload(BaseModel):
+    """First-paint data; sections left out via ?include= are omitted"""
+    version: str
+    projects: Optional[List[Project]] = None
+    featured: Optional[List[Project]] = None
+    skill_categories: Optional[List[Dict[str, Any]]] = None
+    profile: Optional[Dict[str, Any]] = None
+
 class SkillBase(BaseModel):
     """Base model for Skill data"""
     name: str
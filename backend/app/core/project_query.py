@@ -0,0 +1,221 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+# Fields a project query can be sorted by
+SORT_FIELDS = ("id", "title", "start_date", "end_date")
+
+# Comparable sort key: (has_value, value, id). Missing values sort first.
+SortKey = Tuple[int, Any, int]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def _sort_value(project: Dict[str, Any], field: str) -> Any:
+    if field in ("start_date", "end_date"):
+        return _parse_date(project.get(field))
+    if field == "title":
+        return str(project.get("title", "")).casefold()
+    return project.get(field)
+
+
+def _sort_key(value: Any, project_id: int) -> SortKey:
+    return (0, "", project_id) if value is None else (1, value, project_id)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def encode_cursor(field: str, key: SortKey) -> str:
+    """
+    Encode the sort key of the last item on a page as an opaque cursor
+
+    Args:
+        field: Field the results are sorted by
+        key: Sort key of the last returned project
+
+    Returns:
+        URL-safe cursor string
+    """
+    has_value, value, project_id = key
+    if isinstance(value, date):
+        value = value.isoformat()
+    raw = json.dumps([field, has_value, value, project_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field: str) -> SortKey:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous page
+        field: Field the current query sorts by
+
+    Returns:
+        The sort key to continue after
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or was made for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_field, has_value, value, project_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_field != field:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        if not _is_int(has_value) or has_value not in (0, 1) or not _is_int(project_id):
+            raise InvalidCursor("Malformed cursor")
+        if not has_value:
+            if value != "":
+                raise InvalidCursor("Malformed cursor")
+        elif field in ("start_date", "end_date"):
+            value = _parse_date(value) if isinstance(value, str) else None
+            if value is None:
+                raise InvalidCursor("Malformed cursor")
+        elif not isinstance(value, str if field == "title" else int) or isinstance(value, bool):
+            raise InvalidCursor("Malformed cursor")
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    return (has_value, value, project_id)
+
+
+class ProjectQueryIndex:
+    """
+    Precomputed indexes for filtering, sorting and paging projects.
+
+    Built once per catalog version:
+    - an inverted index from case-folded tech name to project ids
+    - the featured id set
+    - projects sorted by start date and by end date, so a date range is two
+      bisects instead of a scan (missing start = open-ended past, missing
+      end = ongoing)
+    - for every sortable field, the ids in sorted order and each id's rank
+    """
+
+    def __init__(self, projects: List[Dict[str, Any]]):
+        projects = [project for project in projects if "id" in project]
+        self.all_ids: FrozenSet[int] = frozenset(project["id"] for project in projects)
+
+        tech: Dict[str, Set[int]] = {}
+        for project in projects:
+            for name in project.get("tech_stack") or []:
+                tech.setdefault(str(name).casefold(), set()).add(project["id"])
+        self.by_tech: Dict[str, FrozenSet[int]] = {name: frozenset(ids) for name, ids in tech.items()}
+
+        self.featured: FrozenSet[int] = frozenset(
+            project["id"] for project in projects if project.get("is_featured", False)
+        )
+        self.not_featured: FrozenSet[int] = self.all_ids - self.featured
+
+        starts = sorted(
+            (_parse_date(project.get("start_date")) or date.min, project["id"]) for project in projects
+        )
+        ends = sorted(
+            (_parse_date(project.get("end_date")) or date.max, project["id"]) for project in projects
+        )
+        self._start_dates = [start for start, _ in starts]
+        self._start_ids = [project_id for _, project_id in starts]
+        self._end_dates = [end for end, _ in ends]
+        self._end_ids = [project_id for _, project_id in ends]
+
+        self.sorted_keys: Dict[str, List[SortKey]] = {}
+        self.sorted_ids: Dict[str, List[int]] = {}
+        self.rank: Dict[str, Dict[int, int]] = {}
+        for field in SORT_FIELDS:
+            keys = sorted(_sort_key(_sort_value(project, field), project["id"]) for project in projects)
+            self.sorted_keys[field] = keys
+            self.sorted_ids[field] = [key[2] for key in keys]
+            self.rank[field] = {key[2]: position for position, key in enumerate(keys)}
+
+    def _date_range(self, date_from: Optional[date], date_to: Optional[date]) -> Optional[Set[int]]:
+        """Ids of projects whose [start, end] interval overlaps [date_from, date_to]"""
+        candidates: Optional[Set[int]] = None
+        if date_to is not None:
+            # Started on or before the end of the range
+            candidates = set(self._start_ids[:bisect_right(self._start_dates, date_to)])
+        if date_from is not None:
+            # Still running on or after the start of the range
+            ended_after = self._end_ids[bisect_left(self._end_dates, date_from):]
+            candidates = set(ended_after) if candidates is None else candidates.intersection(ended_after)
+        return candidates
+
+    def query(
+        self,
+        tech: Sequence[str] = (),
+        match_all: bool = True,
+        featured: Optional[bool] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        sort: str = "id",
+        descending: bool = False,
+        after: Optional[SortKey] = None,
+        limit: int = 20,
+    ) -> Tuple[List[int], int, Optional[SortKey]]:
+        """
+        Run a filtered, sorted, paginated query
+
+        Args:
+            tech: Tech stack names to filter by (case-insensitive)
+            match_all: Require every tech (True) or any of them (False)
+            featured: Only featured (True) or only non-featured (False) projects
+            date_from: Keep projects still running on or after this date
+            date_to: Keep projects started on or before this date
+            sort: One of SORT_FIELDS
+            descending: Reverse the sort order
+            after: Sort key of the last item of the previous page
+            limit: Maximum number of ids to return
+
+        Returns:
+            Tuple of (page of project ids, total matches, sort key of the last
+            returned item if more results remain)
+        """
+        filters: List[FrozenSet[int]] = []
+        if tech:
+            postings = [self.by_tech.get(name.casefold(), frozenset()) for name in tech]
+            filters.append(frozenset.intersection(*postings) if match_all else frozenset().union(*postings))
+        if featured is not None:
+            filters.append(self.featured if featured else self.not_featured)
+        in_range = self._date_range(date_from, date_to)
+        if in_range is not None:
+            filters.append(frozenset(in_range))
+
+        keys = self.sorted_keys[sort]
+        order = self.sorted_ids[sort]
+        if filters:
+            filters.sort(key=len)
+            matched = set(filters[0]).intersection(*filters[1:])
+            rank = self.rank[sort]
+            ranks = sorted(rank[project_id] for project_id in matched)
+        else:
+            ranks = range(len(order))
+        total = len(ranks)
+
+        if descending:
+            if after is not None:
+                ranks = ranks[:bisect_left(ranks, bisect_left(keys, after))]
+            ranks = ranks[::-1]
+        elif after is not None:
+            ranks = ranks[bisect_left(ranks, bisect_right(keys, after)):]
+
+        page = [order[position] for position in ranks[:limit]]
+        next_key = keys[ranks[limit - 1]] if len(ranks) > limit else None
+        return page, total, next_key
+
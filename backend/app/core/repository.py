@@ -0,0 +1,60 @@
+from typing import Optional
+
+from app.core.catalog import CatalogSnapshot, StoredCatalog, projects_catalog, skills_catalog
+from app.core.storage import encode_fragment
+
+
+class ProjectRepository:
+    """
+    Read access to projects for the API routers.
+
+    Every lookup is served from the in-memory snapshot of the catalog
+    store (its id map and the precomputed query indexes) and returns the
+    JSON encoded when the project was written, so requests never wait on
+    the database.
+    """
+
+    def __init__(self, catalog: StoredCatalog):
+        self.catalog = catalog
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current in-memory snapshot of all projects"""
+        return self.catalog.get()
+
+    def get_encoded(self, project_id: int) -> Optional[bytes]:
+        """Encoded project with the given id, or None"""
+        fragment = self.snapshot().encoded.get(project_id)
+        return None if fragment is None else bytes(fragment)
+
+    def featured_encoded(self) -> bytes:
+        """JSON array of the featured projects, in catalog order"""
+        snapshot = self.snapshot()
+        return snapshot.encode_list(snapshot.indexes["featured"])
+
+
+class SkillRepository:
+    """
+    Read access to skills for the API routers.
+
+    Category and proficiency filters run over the in-memory snapshot's
+    per-category index.
+    """
+
+    def __init__(self, catalog: StoredCatalog):
+        self.catalog = catalog
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Current in-memory snapshot of all skills"""
+        return self.catalog.get()
+
+    def filter_json(self, category: Optional[str] = None, min_proficiency: Optional[int] = None) -> bytes:
+        """JSON array of the skills in a category and/or at or above a proficiency, in catalog order"""
+        snapshot = self.snapshot()
+        skills = snapshot.items if category is None else snapshot.indexes["by_category"].get(category, [])
+        if min_proficiency is not None:
+            skills = [skill for skill in skills if skill["proficiency"] >= min_proficiency]
+        return encode_fragment(skills)
+
+
+project_repository = ProjectRepository(projects_catalog)
+skill_repository = SkillRepository(skills_catalog)
@@ -0,0 +1,243 @@
+import logging
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.utils.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class Chunk:
+    """A retrievable piece of context, optionally with a ready-made answer"""
+
+    __slots__ = ("source", "text", "answer")
+
+    def __init__(self, source: str, text: str, answer: Optional[str] = None):
+        self.source = source
+        self.text = text
+        self.answer = answer
+
+
+class RetrievalResult:
+    """
+    Top chunks for a question and how clearly the best one answers it
+
+    ``confidence`` is the share of the question's idf mass the best chunk
+    covers, ``margin`` how many times the runner-up's score the best
+    chunk's score is (infinite without a runner-up) and ``distinctive``
+    whether the question names something found in the best chunk only,
+    such as a project title.
+    """
+
+    __slots__ = ("chunks", "confidence", "margin", "distinctive")
+
+    def __init__(self, chunks: List[Chunk], confidence: float, margin: float = 0.0, distinctive: bool = False):
+        self.chunks = chunks
+        self.confidence = confidence
+        self.margin = margin
+        self.distinctive = distinctive
+
+    @property
+    def context(self) -> str:
+        return "\n\n".join(chunk.text for chunk in self.chunks)
+
+
+# Suffixes stripped so inflections share a term ("located"/"location", "projects"/"project")
+_SUFFIXES = ("ions", "ion", "ings", "ing", "ies", "ed", "es", "s")
+
+
+def analyze(text: str) -> List[str]:
+    """Tokenize text and strip common English suffixes"""
+    terms = []
+    for token in tokenize(text):
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                token = token[:-len(suffix)] + ("y" if suffix == "ies" else "")
+                break
+        terms.append(token)
+    return terms
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)"""
+    return math.ceil(len(text) / 4)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a list of chunks, scored with NumPy.
+
+    Per-term BM25 weights are precomputed and stored as postings in three
+    flat arrays (term offsets, chunk ids, weights), so memory grows with
+    the number of (term, chunk) pairs rather than chunks x vocabulary.
+    Scoring a query gathers the postings of its terms and sums them per
+    chunk with one ``np.bincount``. NumPy is imported when the first index
+    is built rather than at app startup.
+    """
+
+    def __init__(self, chunks: List[Chunk], k1: float = 1.5, b: float = 0.75):
+        import numpy as np
+
+        self.chunks = chunks
+        docs = [analyze(chunk.text) for chunk in chunks]
+        n_docs = len(docs)
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for doc_id, tokens in enumerate(docs):
+            for token in tokens:
+                counts = postings.setdefault(token, {})
+                counts[doc_id] = counts.get(doc_id, 0) + 1
+
+        lengths = np.array([len(tokens) for tokens in docs], dtype=np.float32)
+        avg_length = float(lengths.mean()) if n_docs and lengths.mean() > 0 else 1.0
+        norm = k1 * (1 - b + b * lengths / avg_length)
+
+        self.vocab: Dict[str, int] = {}
+        self.idf = np.zeros(len(postings), dtype=np.float32)
+        # Chunk a term occurs in when it occurs in exactly one, else -1
+        self.only_doc = np.full(len(postings), -1, dtype=np.int64)
+        offsets = [0]
+        doc_ids: List[int] = []
+        freqs: List[int] = []
+        for term_id, (term, counts) in enumerate(postings.items()):
+            self.vocab[term] = term_id
+            self.idf[term_id] = math.log(1 + (n_docs - len(counts) + 0.5) / (len(counts) + 0.5))
+            if len(counts) == 1:
+                self.only_doc[term_id] = next(iter(counts))
+            doc_ids.extend(counts.keys())
+            freqs.extend(counts.values())
+            offsets.append(len(doc_ids))
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.doc_ids = np.array(doc_ids, dtype=np.int64)
+        tf = np.array(freqs, dtype=np.float32)
+        term_of_posting = np.repeat(np.arange(len(postings)), np.diff(self.offsets))
+        self.weights = self.idf[term_of_posting] * tf * (k1 + 1) / (tf + norm[self.doc_ids])
+        # Idf a term would have if it appeared in no chunk at all
+        self.max_idf = math.log(1 + (n_docs + 0.5) / 0.5)
+
+    def search(self, query: str, k: int) -> RetrievalResult:
+        """
+        Find the k best chunks for a query
+
+        Confidence is the share of the query's idf mass that the best chunk
+        covers; terms missing from every chunk count at maximum idf, so a
+        question about something the profile never mentions scores low.
+        Coverage alone is close to 1 for most on-topic questions, so the
+        result also carries the score margin over the runner-up and
+        whether a query term occurs in the best chunk alone.
+
+        Args:
+            query: User question
+            k: Number of chunks to return
+
+        Returns:
+            RetrievalResult with chunks in descending score order
+        """
+        import numpy as np
+
+        terms = list(dict.fromkeys(analyze(query)))
+        term_ids = [self.vocab[term] for term in terms if term in self.vocab]
+        if not term_ids or not self.chunks:
+            return RetrievalResult([], 0.0)
+
+        slices = [np.arange(self.offsets[t], self.offsets[t + 1]) for t in term_ids]
+        positions = np.concatenate(slices)
+        docs = self.doc_ids[positions]
+        scores = np.bincount(docs, weights=self.weights[positions], minlength=len(self.chunks))
+        term_idf = np.repeat(self.idf[term_ids], [len(s) for s in slices])
+        covered = np.bincount(docs, weights=term_idf, minlength=len(self.chunks))
+
+        k = min(k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = [int(doc_id) for doc_id in top if scores[doc_id] > 0]
+
+        if not top:
+            return RetrievalResult([], 0.0)
+        total_idf = float(self.idf[term_ids].sum()) + self.max_idf * (len(terms) - len(term_ids))
+        confidence = float(covered[top[0]]) / total_idf
+        runner_up = float(np.partition(scores, -2)[-2]) if len(self.chunks) > 1 else 0.0
+        margin = float(scores[top[0]]) / runner_up if runner_up > 0 else math.inf
+        distinctive = bool((self.only_doc[term_ids] == top[0]).any())
+        return RetrievalResult([self.chunks[doc_id] for doc_id in top], confidence, margin, distinctive)
+
+
+def chunk_personal_context(context: str) -> List[Chunk]:
+    """Split the free-text profile into paragraphs, with one chunk per numbered project"""
+    chunks = []
+    in_projects = False
+    for block in re.split(r"\n\s*\n", context.strip()):
+        block = block.strip()
+        if block.startswith("Projects:"):
+            in_projects = True
+            block = block[len("Projects:"):].strip()
+        elif not re.match(r"\d+\.\s", block):
+            in_projects = False
+        if not block:
+            continue
+        if in_projects:
+            chunks.append(Chunk("profile", "Project: " + re.sub(r"^\d+\.\s*", "", block)))
+        else:
+            chunks.append(Chunk("profile", block))
+    return chunks
+
+
+def chunk_projects(projects: List[Dict[str, Any]]) -> List[Chunk]:
+    chunks = []
+    for project in projects:
+        tech = ", ".join(project.get("tech_stack") or [])
+        period = f"{project.get('start_date') or 'unknown'} to {project.get('end_date') or 'present'}"
+        text = (f"Project: {project.get('title', '')}\n{project.get('description', '')}\n"
+                f"Technologies: {tech}\nPeriod: {period}")
+        answer = f"{project.get('title', '')}: {project.get('description', '')} (Technologies: {tech})"
+        chunks.append(Chunk("projects", text, answer))
+    return chunks
+
+
+def chunk_skills(skills: List[Dict[str, Any]]) -> List[Chunk]:
+    by_category: Dict[str, List[str]] = {}
+    for skill in skills:
+        entry = f"{skill.get('name', '')} ({skill.get('proficiency', '?')}/5)"
+        if skill.get("description"):
+            entry += f": {skill['description']}"
+        by_category.setdefault(skill.get("category", "Other"), []).append(entry)
+    return [
+        Chunk("skills", f"Skills - {category}:\n" + "\n".join(entries))
+        for category, entries in by_category.items()
+    ]
+
+
+class ContextRetriever:
+    """
+    BM25 index over every source the chatbot can draw on, rebuilt when any
+    source changes.
+
+    ``sources`` returns (version, chunks) pairs; the index is cached under
+    the tuple of versions, so a request only pays for the version check
+    unless a data file was edited.
+    """
+
+    def __init__(self, sources: Callable[[], List[Tuple[str, Callable[[], List[Chunk]]]]]):
+        self._sources = sources
+        self._cached: Optional[Tuple[Tuple[str, ...], BM25Index]] = None
+        self._lock = threading.Lock()
+
+    def index(self) -> BM25Index:
+        sources = self._sources()
+        key = tuple(version for version, _ in sources)
+        cached = self._cached
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with self._lock:
+            cached = self._cached
+            if cached is None or cached[0] != key:
+                chunks = [chunk for _, build in sources for chunk in build()]
+                cached = self._cached = (key, BM25Index(chunks))
+                logger.info(f"Built retrieval index over {len(chunks)} chunks")
+            return cached[1]
+
+    def retrieve(self, question: str, k: int) -> RetrievalResult:
+        return self.index().search(question, k)
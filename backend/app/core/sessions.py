@@ -0,0 +1,246 @@
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.retrieval import estimate_tokens
+
+# One exchange: (user question, assistant answer)
+Turn = Tuple[str, str]
+
+# session_id a client sends to start a conversation
+NEW_SESSION = "new"
+
+# Bytes held by a turn beyond its two strings
+_TURN_OVERHEAD = sys.getsizeof(("", ""))
+
+
+def _turn_bytes(turn: Turn) -> int:
+    return _TURN_OVERHEAD + sys.getsizeof(turn[0]) + sys.getsizeof(turn[1])
+
+
+class ChatSession:
+    """
+    One conversation: a ring buffer of its most recent turns.
+
+    Slotted, so a session costs its strings plus a few hundred bytes;
+    ``nbytes`` tracks that total as turns come and go.
+    """
+
+    __slots__ = ("session_id", "turns", "expires_at", "nbytes")
+
+    def __init__(self, session_id: str, max_turns: int, expires_at: float):
+        self.session_id = session_id
+        self.turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.expires_at = expires_at
+        self.nbytes = sys.getsizeof(self) + sys.getsizeof(self.turns) + sys.getsizeof(session_id)
+
+
+class SessionStore:
+    """
+    Bounded in-memory store of chat sessions.
+
+    Sessions expire after ``ttl_seconds`` without a turn and are kept in
+    least-recently-used order. Adding a turn evicts expired sessions, then
+    the least recently used ones until the store is back under both
+    ``max_sessions`` and ``max_bytes``, so memory stays capped however
+    many clients chat. Each turn is cut to ``max_turn_chars`` per side
+    before it is stored, which bounds a single session too.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_sessions: int,
+        max_bytes: int,
+        max_turns: int,
+        max_turn_chars: int,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.max_turns = max_turns
+        self.max_turn_chars = max_turn_chars
+        # session id -> session, least recently used first
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.evictions = {"expired": 0, "lru": 0, "memory": 0}
+
+    @staticmethod
+    def new_id() -> str:
+        return secrets.token_urlsafe(16)
+
+    def _live(self, session_id: str, now: float) -> Optional[ChatSession]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.expires_at <= now:
+            self._evict(session_id, "expired")
+            return None
+        return session
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        session = self._sessions.pop(session_id)
+        self.nbytes -= session.nbytes
+        self.evictions[reason] += 1
+
+    def resolve(self, session_id: Optional[str]) -> Optional[str]:
+        """
+        Get the id to continue a conversation under
+
+        Sessions are opt-in, so one-shot callers (and bots) never take a
+        slot: only a client that asks for a session (NEW_SESSION) or sends
+        back the id of an earlier answer gets one.
+
+        Args:
+            session_id: Id sent by the client, if any
+
+        Returns:
+            None without an id, the same id if that session is still live,
+            otherwise a new id
+        """
+        if not session_id:
+            return None
+        if session_id != NEW_SESSION:
+            with self._lock:
+                if self._live(session_id, time.monotonic()) is not None:
+                    return session_id
+        return self.new_id()
+
+    def turns(self, session_id: str) -> List[Turn]:
+        """Recent turns of a session, oldest first (empty for an unknown session)"""
+        with self._lock:
+            session = self._live(session_id, time.monotonic())
+            return list(session.turns) if session is not None else []
+
+    def record(self, session_id: str, question: str, answer: str) -> None:
+        """
+        Append a turn to a session, creating the session if needed
+
+        Args:
+            session_id: Session id from resolve()
+            question: User message
+            answer: Answer that was sent back
+        """
+        turn = (question[:self.max_turn_chars], answer[:self.max_turn_chars])
+        now = time.monotonic()
+        with self._lock:
+            session = self._live(session_id, now)
+            if session is None:
+                session = ChatSession(session_id, self.max_turns, now + self.ttl_seconds)
+                self._sessions[session_id] = session
+                self.nbytes += session.nbytes
+            if len(session.turns) == self.max_turns:
+                dropped = _turn_bytes(session.turns[0])
+                session.nbytes -= dropped
+                self.nbytes -= dropped
+            session.turns.append(turn)
+            added = _turn_bytes(turn)
+            session.nbytes += added
+            self.nbytes += added
+            session.expires_at = now + self.ttl_seconds
+            self._sessions.move_to_end(session_id)
+            self._shrink(now)
+
+    def _shrink(self, now: float) -> None:
+        # Idle sessions sit at the front, so expired ones are found without a full scan
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if oldest.expires_at <= now:
+                self._evict(oldest_id, "expired")
+            elif len(self._sessions) > self.max_sessions:
+                self._evict(oldest_id, "lru")
+            elif self.nbytes > self.max_bytes and len(self._sessions) > 1:
+                self._evict(oldest_id, "memory")
+            else:
+                break
+
+    def session_stats(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Turn count, memory and remaining idle time of one session, or None"""
+        now = time.monotonic()
+        with self._lock:
+            session = self._live(session_id, now)
+            if session is None:
+                return None
+            return {
+                "turns": len(session.turns),
+                "bytes": session.nbytes,
+                "expires_in_seconds": round(session.expires_at - now, 1),
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """Session count, memory use against the cap and eviction counters"""
+        with self._lock:
+            sizes = [session.nbytes for session in self._sessions.values()]
+            return {
+                "sessions": len(sizes),
+                "max_sessions": self.max_sessions,
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "avg_bytes_per_session": round(sum(sizes) / len(sizes)) if sizes else 0,
+                "max_bytes_per_session": max(sizes, default=0),
+                "evictions": dict(self.evictions),
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+def format_history(turns: Sequence[Turn], max_tokens: int) -> str:
+    """
+    Render recent turns for a prompt within a token budget
+
+    The newest turns are kept verbatim while they fit; older ones are
+    summarized as a list of the questions asked, as far as the budget
+    allows, and the rest are left out.
+
+    Args:
+        turns: Turns, oldest first
+        max_tokens: Budget for the whole block
+
+    Returns:
+        The history block, or "" if there are no turns
+    """
+    kept: List[str] = []
+    used = 0
+    index = len(turns)
+    for question, answer in reversed(turns):
+        text = f"User: {question}\nAssistant: {answer}"
+        cost = estimate_tokens(text)
+        if used + cost > max_tokens:
+            if not kept:
+                # Always keep the last exchange, cut to the budget
+                text = text[:max_tokens * 4]
+                kept.append(text)
+                used += estimate_tokens(text)
+                index -= 1
+            break
+        kept.append(text)
+        used += cost
+        index -= 1
+
+    summary = ""
+    for question, _ in reversed(turns[:index]):
+        line = f"- {question[:80]}\n"
+        if used + estimate_tokens(line) > max_tokens:
+            break
+        summary = line + summary
+        used += estimate_tokens(line)
+
+    if not kept:
+        return ""
+    block = "\n".join(reversed(kept))
+    if summary:
+        block = f"Earlier questions:\n{summary}\n{block}"
+    return block
+
+
+chat_sessions = SessionStore(
+    ttl_seconds=settings.CHAT_SESSION_TTL_SECONDS,
+    max_sessions=settings.CHAT_SESSION_MAX_SESSIONS,
+    max_bytes=int(settings.CHAT_SESSION_MAX_MEMORY_MB * 1024 * 1024),
+    max_turns=settings.CHAT_SESSION_MAX_TURNS,
+    max_turn_chars=settings.CHAT_SESSION_MAX_TURN_CHARS,
+)
@@ -0,0 +1,94 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development only
+    fcntl = None
+
+# File layout: MAGIC, header length (u32, little endian), JSON header, blob
+MAGIC = b"PFSNAP1\n"
+_LENGTH = struct.Struct("<I")
+
+
+class MappedSnapshot:
+    """
+    Read-only memory map of a snapshot file.
+
+    Every process that maps the same file shares its pages through the OS
+    page cache, so N workers hold one copy of the blob. A replaced file
+    stays mapped (and valid) until its last MappedSnapshot is dropped.
+    """
+
+    __slots__ = ("header", "blob", "_map")
+
+    def __init__(self, header: Dict[str, Any], blob: memoryview, mapped: mmap.mmap):
+        self.header = header
+        self.blob = blob
+        self._map = mapped
+
+
+def write_snapshot(path: Path, header: Dict[str, Any], blob: bytes) -> None:
+    """
+    Atomically publish a snapshot file
+
+    The file is written under a temporary name in the same directory,
+    fsynced and renamed over ``path``, so readers see the old or the new
+    snapshot, never a partial one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(encoded_header)))
+            f.write(encoded_header)
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_snapshot(path: Path) -> Optional[MappedSnapshot]:
+    """Map a snapshot file, or return None if it is missing or not a snapshot"""
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        # ValueError: empty file
+        return None
+    prefix = len(MAGIC) + _LENGTH.size
+    if len(mapped) < prefix or mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        return None
+    (header_length,) = _LENGTH.unpack(mapped[len(MAGIC):prefix])
+    header = json.loads(mapped[prefix:prefix + header_length])
+    return MappedSnapshot(header, memoryview(mapped)[prefix + header_length:], mapped)
+
+
+@contextmanager
+def exclusive_lock(path: Path) -> Iterator[None]:
+    """Hold an inter-process lock tied to ``path`` (a no-op without fcntl)"""
+    if fcntl is None:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(str(path) + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Row = List[Any]
+
+
+class WriteBehindSpool:
+    """
+    Durable local queue of rows waiting to be written to a slow upstream.
+
+    Rows are committed to a SQLite database (WAL, synchronous=FULL) before
+    enqueue() returns, so an accepted row survives a crash or restart. A
+    background flusher sends due rows in batches through a blocking
+    ``send(rows)`` callable run in a worker thread, deletes them once the
+    call succeeds and reschedules the whole batch with exponential backoff
+    and jitter when it fails. Delivery is at-least-once.
+
+    Several processes (e.g. gunicorn workers) may flush the same spool:
+    a batch is leased by pushing its next_attempt_at ``lease`` seconds
+    ahead in the same transaction that selects it, so other flushers skip
+    it while it is in flight. If the owner dies, the rows come due again
+    when the lease expires.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = 50,
+        flush_interval: float = 2.0,
+        retry_base: float = 2.0,
+        retry_max: float = 300.0,
+        lease: float = 120.0,
+    ):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lease = lease
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS spool (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    row TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS spool_due ON spool (next_attempt_at, id)")
+            self._conn = conn
+        return self._conn
+
+    def enqueue(self, row: Row) -> int:
+        """
+        Durably store a row for delivery (blocking; call from a thread)
+
+        Args:
+            row: JSON-serializable list of cell values
+
+        Returns:
+            Spool id of the stored row
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connect().execute(
+                "INSERT INTO spool (row, created_at, next_attempt_at) VALUES (?, ?, ?)",
+                (json.dumps(row), now, now),
+            )
+            row_id = cursor.lastrowid
+        if self._loop is not None:
+            # enqueue() runs in a worker thread; wake the flusher on its loop
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return row_id
+
+    def pending(self) -> int:
+        """Number of rows not yet delivered"""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    def _due_batch(self) -> List[Tuple[int, int, Row]]:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, attempts, row FROM spool WHERE next_attempt_at <= ? ORDER BY id LIMIT ?",
+                    (now, self.batch_size),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE spool SET next_attempt_at = ? WHERE id = ?",
+                    [(now + self.lease, row_id) for row_id, _, _ in rows],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return [(row_id, attempts, json.loads(row)) for row_id, attempts, row in rows]
+
+    def _ack(self, ids: List[int]) -> None:
+        with self._lock:
+            self._connect().executemany("DELETE FROM spool WHERE id = ?", [(row_id,) for row_id in ids])
+
+    def _retry_later(self, ids: List[int], attempts: int) -> float:
+        delay = min(self.retry_max, self.retry_base * (2 ** attempts))
+        delay *= random.uniform(0.5, 1.0)
+        with self._lock:
+            self._connect().executemany(
+                "UPDATE spool SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?",
+                [(time.time() + delay, row_id) for row_id in ids],
+            )
+        return delay
+
+    def flush_once(self, send: Callable[[List[Row]], Any]) -> int:
+        """
+        Send one batch of due rows (blocking)
+
+        Args:
+            send: Callable writing a list of rows upstream in a single call
+
+        Returns:
+            Number of rows delivered
+        """
+        batch = self._due_batch()
+        if not batch:
+            return 0
+        ids = [row_id for row_id, _, _ in batch]
+        try:
+            send([row for _, _, row in batch])
+        except Exception as e:
+            delay = self._retry_later(ids, max(attempts for _, attempts, _ in batch))
+            logger.warning(f"Failed to flush {len(ids)} spooled rows, retrying in {delay:.1f}s: {e}")
+            return 0
+        self._ack(ids)
+        logger.info(f"Flushed {len(ids)} spooled rows")
+        return len(ids)
+
+    async def _run(self, send: Callable[[List[Row]], Any]) -> None:
+        while True:
+            # Cleared before flushing so a row enqueued mid-flush still wakes us
+            self._wakeup.clear()
+            try:
+                delivered = await asyncio.to_thread(self.flush_once, send)
+            except Exception as e:
+                logger.error(f"Spool flusher error: {e}")
+                delivered = 0
+            if delivered == self.batch_size:
+                # More may be waiting; keep draining without sleeping
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+                # Give concurrent submissions a moment to join the batch
+                await asyncio.sleep(min(0.2, self.flush_interval))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, send: Callable[[List[Row]], Any]) -> None:
+        """Start the background flusher; rows left over from a previous run are replayed"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(send))
+        logger.info(f"Spool flusher started with {self.pending()} pending rows")
+
+    async def stop(self) -> None:
+        """Stop the background flusher; undelivered rows stay on disk"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
@@ -0,0 +1,540 @@
+"""
+SQLite storage for the portfolio catalogs (projects and skills)
+
+Usage (from backend/), to (re)import the JSON files:
+    python -m app.core.storage import [--force]
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.models import Project, ProjectBase, Skill, SkillBase
+from app.utils.helpers import get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Catalog name -> (model validating its items, JSON file it is imported from)
+CATALOGS: Dict[str, Tuple[Type[BaseModel], str]] = {
+    "projects": (Project, "projects.json"),
+    "skills": (Skill, "skills.json"),
+}
+
+# Models for rows uploaded without their id (see StagedImport)
+BASE_MODELS: Dict[str, Type[BaseModel]] = {"projects": ProjectBase, "skills": SkillBase}
+
+# Insert statement for a catalog table, in the column order of table_row()
+INSERT = "INSERT INTO {table} (id, position, data, encoded) VALUES (?, ?, ?, ?)"
+
+# (mtime in ns, size) of the JSON file a catalog was imported from
+FileSeed = Tuple[int, int]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    stamp TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS catalog_seed (
+    name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    encoded TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    encoded TEXT NOT NULL
+);
+"""
+
+# Per-connection staging table for StagedImport, mirroring a catalog table above
+STAGING_SCHEMA = """
+CREATE TEMP TABLE {name}_import (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    encoded TEXT NOT NULL
+);
+"""
+
+
+def file_seed(path: Path) -> FileSeed:
+    """
+    Identify the current version of a JSON file
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def encode_fragment(payload: Any) -> bytes:
+    """Compact UTF-8 JSON for an already JSON-ready value, as JSONResponse would render it"""
+    return json.dumps(
+        payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def normalize_items(
+    model: Optional[Type[BaseModel]], items: Sequence[Any], source: str
+) -> Tuple[List[Dict[str, Any]], List[bytes]]:
+    """
+    Validate items against a model
+
+    Args:
+        model: Pydantic model, or None to take items as they are
+        items: Raw items
+        source: Name used in error messages
+
+    Returns:
+        Tuple of (items in normalized JSON form with defaults filled in and
+        extra keys preserved, each item encoded as the model serializes it)
+
+    Raises:
+        ValueError: If an item does not validate
+    """
+    if model is None:
+        return list(items), [encode_fragment(item) for item in items]
+    normalized_items = []
+    fragments = []
+    for position, item in enumerate(items):
+        try:
+            normalized = model_json(model, item)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{source} item {position} is invalid: {e}") from e
+        normalized_items.append({**item, **normalized})
+        fragments.append(encode_fragment(normalized))
+    return normalized_items, fragments
+
+
+def model_json(model: Type[BaseModel], item: Any) -> Dict[str, Any]:
+    """
+    Validate one item and return it as the model serializes it to JSON
+
+    Raises:
+        TypeError, ValueError: If the item does not validate
+    """
+    record = model(**item)
+    # pydantic 2 dumps straight to JSON types, several times faster than jsonable_encoder
+    if hasattr(record, "model_dump"):
+        return record.model_dump(mode="json")
+    return jsonable_encoder(record)
+
+
+def describe_error(error: Exception) -> str:
+    """One-line description of a validation error"""
+    if hasattr(error, "errors"):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
+
+
+def table_row(position: int, item: Dict[str, Any], fragment: bytes) -> Tuple[Any, ...]:
+    """Values for INSERT of one normalized item"""
+    return (item["id"], position, encode_fragment(item).decode("utf-8"), fragment.decode("utf-8"))
+
+
+class CatalogStore:
+    """
+    SQLite database (WAL mode) holding the projects and skills catalogs.
+
+    Items are validated once when written and stored twice: their
+    normalized JSON and the JSON responses are built from. A catalog is
+    replaced as a whole in one transaction that also bumps its version in
+    catalog_meta, so readers (other threads or worker processes) see the
+    old or the new catalog, never a mix, and can detect changes by reading
+    the version. Each thread (and forked process) uses its own connection.
+    Lookups by anything but the whole catalog are served from the in-memory
+    snapshots and their indexes (see app.core.catalog), so the tables are
+    only keyed by id.
+
+    A catalog imported from its JSON file remembers that file's version in
+    catalog_seed, and ``sync_json`` re-imports it when the file changes.
+    Any other write (an admin import) clears the record, so such a catalog
+    is never overwritten by a later edit of the file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        # Catalog name -> JSON file version this process last checked against the store
+        self._checked_seeds: Dict[str, FileSeed] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # A connection must not be used across fork (gunicorn preloads in the master)
+        if conn is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+                    self.import_json(only_missing=True)
+        return conn
+
+    def version(self, name: str) -> Optional[Tuple[int, str]]:
+        """
+        Current version of a catalog
+
+        Returns:
+            Tuple of (version counter, random stamp of the write that set
+            it, which tells apart databases that were re-created), or None
+            if the catalog was never imported
+        """
+        row = self._connect().execute(
+            "SELECT version, stamp FROM catalog_meta WHERE name = ?", (name,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def seed(self, name: str) -> Optional[FileSeed]:
+        """Version of the JSON file a catalog was imported from, or None if it was last written otherwise"""
+        row = self._connect().execute(
+            "SELECT mtime_ns, size FROM catalog_seed WHERE name = ?", (name,)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def replace(
+        self,
+        name: str,
+        items: Sequence[Any],
+        source: Optional[str] = None,
+        seed: Optional[FileSeed] = None,
+        if_seed: Optional[FileSeed] = None,
+    ) -> Optional[int]:
+        """
+        Validate and atomically replace a whole catalog
+
+        Args:
+            name: "projects" or "skills"
+            items: Raw items
+            source: Where the items came from, for the record
+            seed: Version of the JSON file the items were read from
+            if_seed: Only replace the catalog if it is still seeded from
+                this file version (checked inside the write transaction)
+
+        Returns:
+            The catalog's new version counter, or None if ``if_seed`` no
+            longer matched and nothing was written
+
+        Raises:
+            ValueError: If an item does not validate; nothing is written
+        """
+        model, _ = CATALOGS[name]
+        normalized, fragments = normalize_items(model, items, source or name)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if if_seed is not None and self.seed(name) != if_seed:
+                # Another process re-imported the file, or an admin import replaced it
+                conn.execute("ROLLBACK")
+                return None
+            self._clear(conn, name)
+            conn.executemany(
+                INSERT.format(table=name),
+                [table_row(position, item, fragment)
+                 for position, (item, fragment) in enumerate(zip(normalized, fragments))],
+            )
+            version = self._bump_version(conn, name, source, seed)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Stored {len(normalized)} {name} as version {version}")
+        return version
+
+    @staticmethod
+    def _clear(conn: sqlite3.Connection, name: str) -> None:
+        conn.execute(f"DELETE FROM {name}")
+
+    @staticmethod
+    def _bump_version(
+        conn: sqlite3.Connection, name: str, source: Optional[str], seed: Optional[FileSeed] = None
+    ) -> int:
+        """Record a new version of a catalog (and the JSON file it came from) inside the current write transaction"""
+        conn.execute(
+            """INSERT INTO catalog_meta (name, version, stamp, source) VALUES (?, 1, ?, ?)
+               ON CONFLICT(name) DO UPDATE
+               SET version = version + 1, stamp = excluded.stamp, source = excluded.source""",
+            (name, uuid.uuid4().hex, source),
+        )
+        conn.execute("DELETE FROM catalog_seed WHERE name = ?", (name,))
+        if seed is not None:
+            conn.execute("INSERT INTO catalog_seed (name, mtime_ns, size) VALUES (?, ?, ?)", (name, *seed))
+        return conn.execute("SELECT version FROM catalog_meta WHERE name = ?", (name,)).fetchone()[0]
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Open a dedicated connection (for long-running work such as imports)
+
+        It may be used from one thread at a time and must be closed by the caller.
+        """
+        self._connect()
+        conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def rows(self, name: str) -> Tuple[Optional[Tuple[int, str]], List[Dict[str, Any]], List[bytes]]:
+        """
+        Read a whole catalog consistently
+
+        Returns:
+            Tuple of (version, items in order, encoded items)
+        """
+        conn = self._connect()
+        # One read transaction so the version matches the rows
+        conn.execute("BEGIN")
+        try:
+            version = self.version(name)
+            rows = conn.execute(f"SELECT data, encoded FROM {name} ORDER BY position").fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return version, [json.loads(data) for data, _ in rows], [encoded.encode("utf-8") for _, encoded in rows]
+
+    def import_json(self, only_missing: bool = False, data_dir: Optional[Path] = None) -> Dict[str, int]:
+        """
+        Import the catalogs from their JSON files
+
+        Args:
+            only_missing: Skip catalogs that were already imported
+            data_dir: Directory holding the JSON files (defaults to the data dir)
+
+        Returns:
+            Mapping of imported catalog name to its new version
+        """
+        data_dir = Path(data_dir or get_data_dir())
+        imported = {}
+        for name, (_, file_name) in CATALOGS.items():
+            if only_missing and self.version(name) is not None:
+                continue
+            try:
+                imported[name] = self._import_file(name, data_dir / file_name)
+            except FileNotFoundError:
+                logger.warning(f"No {file_name} to import {name} from")
+        return imported
+
+    def sync_json(self, name: str, data_dir: Optional[Path] = None) -> Optional[int]:
+        """
+        Re-import a catalog if its JSON file changed since it was imported
+
+        Costs one ``os.stat`` while the file is unchanged. A catalog that
+        was last replaced some other way (an admin import) is left alone
+        and a warning is logged instead, once per version of the file.
+
+        Returns:
+            The catalog's new version counter, or None if it was not re-imported
+        """
+        _, file_name = CATALOGS[name]
+        path = Path(data_dir or get_data_dir()) / file_name
+        try:
+            current = file_seed(path)
+        except FileNotFoundError:
+            return None
+        if self._checked_seeds.get(name) == current:
+            return None
+        stored = self.seed(name)
+        self._checked_seeds[name] = current
+        if stored == current:
+            return None
+        if stored is None and self.version(name) is not None:
+            logger.warning(
+                f"The {name} catalog was not imported from the current {file_name}; "
+                "run `python -m app.core.storage import --force` to load the file"
+            )
+            return None
+        try:
+            version = self._import_file(name, path, if_seed=stored)
+        except (OSError, ValueError) as e:
+            # Retried when the file changes again
+            logger.error(f"Error re-importing {file_name}: {e}")
+            return None
+        if version is not None:
+            logger.info(f"Re-imported {name} from the updated {file_name}")
+        return version
+
+    def _import_file(self, name: str, path: Path, if_seed: Optional[FileSeed] = None) -> Optional[int]:
+        """Replace a catalog with the contents of a JSON file (see ``replace``)"""
+        # Stat before reading, so a write during the read shows up as a newer version
+        seed = file_seed(path)
+        with open(path, "rb") as f:
+            items = json.load(f)
+        if not isinstance(items, list):
+            raise ValueError(f"{path} must contain a JSON list")
+        return self.replace(name, items, source=path.name, seed=seed, if_seed=if_seed)
+
+
+class StagedImport:
+    """
+    Bulk replacement of one catalog, fed one row at a time.
+
+    Each row is validated against the catalog's base model as it arrives;
+    an ``id`` is optional and defaults to one more than the largest id so
+    far. Valid rows are buffered up to ``batch_size`` and ``flush`` writes
+    them to a TEMP staging table on a dedicated connection, which SQLite
+    keeps in a temporary file, so memory stays flat however large the
+    upload is. ``commit`` swaps the staged rows in with one transaction
+    that also bumps the catalog version: readers keep seeing the previous
+    catalog until it commits (in WAL mode they never wait on the writer),
+    and a crash before then leaves the catalog untouched. If any row was
+    rejected, nothing is swapped in.
+
+    ``flush``, ``commit`` and ``close`` do disk I/O; async callers should
+    run them in a thread.
+    """
+
+    def __init__(
+        self,
+        store: CatalogStore,
+        name: str,
+        source: Optional[str] = None,
+        batch_size: int = 500,
+        max_errors: int = 100,
+    ):
+        self.store = store
+        self.name = name
+        self.source = source
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self._model = BASE_MODELS[name]
+        self._batch: List[Tuple[int, Dict[str, Any], bytes]] = []
+        self._max_id = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._conn = store.connect()
+        # Staging stays on disk however large the import gets
+        self._conn.execute("PRAGMA temp_store=FILE")
+        self._conn.executescript(STAGING_SCHEMA.format(name=name))
+
+    def reject(self, line: int, message: str) -> None:
+        """Record a rejected row; only the first max_errors are kept"""
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def add(self, line: int, row: Any) -> bool:
+        """
+        Validate one row and buffer it
+
+        Args:
+            line: Line number of the row in the upload, for error reports
+            row: Parsed JSON value
+
+        Returns:
+            True when the buffer is full and should be flushed
+        """
+        if not isinstance(row, dict):
+            self.reject(line, "expected a JSON object")
+            return False
+        try:
+            normalized = model_json(self._model, row)
+        except (TypeError, ValueError) as e:
+            self.reject(line, describe_error(e))
+            return False
+        item_id = row.get("id")
+        if item_id is None:
+            item_id = self._max_id + 1
+        elif not isinstance(item_id, int) or isinstance(item_id, bool) or item_id < 1:
+            self.reject(line, "id: must be a positive integer")
+            return False
+        self._max_id = max(self._max_id, item_id)
+        # Same key order as the full model (base fields, then id)
+        normalized["id"] = item_id
+        self._batch.append((line, {**row, **normalized}, encode_fragment(normalized)))
+        return len(self._batch) >= self.batch_size
+
+    def flush(self) -> None:
+        """Write the buffered rows to the staging table"""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        insert = INSERT.format(table=f"temp.{self.name}_import")
+        self._conn.execute("BEGIN")
+        try:
+            for line, item, fragment in batch:
+                try:
+                    self._conn.execute(insert, table_row(self.accepted, item, fragment))
+                except sqlite3.IntegrityError:
+                    self.reject(line, f"id: duplicate id {item['id']}")
+                    continue
+                self.accepted += 1
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def commit(self) -> Optional[int]:
+        """
+        Swap the staged rows in if every row was valid
+
+        Returns:
+            The catalog's new version counter, or None if rows were rejected
+        """
+        self.flush()
+        if self.rejected:
+            return None
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            CatalogStore._clear(conn, self.name)
+            conn.execute(f"INSERT INTO main.{self.name} SELECT * FROM temp.{self.name}_import")
+            version = CatalogStore._bump_version(conn, self.name, self.source)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Imported {self.accepted} {self.name} as version {version}")
+        return version
+
+    def close(self) -> None:
+        """Drop the staging table"""
+        self._conn.close()
+
+
+catalog_store = CatalogStore(settings.CATALOG_DB_PATH or get_data_dir() / "catalog.sqlite3")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the catalog database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Import projects.json and skills.json")
+    import_parser.add_argument("--force", action="store_true", help="Replace catalogs that were already imported")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "import":
+        imported = catalog_store.import_json(only_missing=not args.force)
+        print(f"Imported: {imported or 'nothing (already imported; use --force)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,38 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import projects, skills, contact, chatbot
-import os
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+import asyncio
+import logging
 
-# Load environment variables
-load_dotenv()
+# Environment variables are loaded from .env by app.core.config
+from app.api.routes import admin, bootstrap, projects, skills, contact, chatbot
+from app.core.catalog import catalog_poller
+from app.core.clients import google_clients
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, registry
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work once the server is up and stop it on shutdown"""
+    # Load the Google SDKs in the background so startup does not wait for them
+    asyncio.get_running_loop().run_in_executor(None, google_clients.warm_up)
+    # Load the catalogs off the event loop and keep them current from then on
+    await catalog_poller.start()
+    chatbot.warm_up_retrieval_index()
+    await contact.start_contact_spool()
+    try:
+        yield
+    finally:
+        await contact.stop_contact_spool()
+        await catalog_poller.stop()
 
 app = FastAPI(
     title="Portfolio API",
     description="API for my personal portfolio website",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Define allowed origins
@@ -28,20 +50,30 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
     expose_headers=["*"],
-    max_age=600,  # Cache preflight requests for 10 minutes
+    max_age=86400,  # Cache preflight requests for a day (browsers may cap it lower)
 )
 
+# Record request counts and latency per route template
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(skills.router, prefix="/api/skills", tags=["skills"])
 app.include_router(contact.router, prefix="/api/contact", tags=["contact"])
 app.include_router(chatbot.router, prefix="/api/chatbot", tags=["chatbot"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+app.include_router(bootstrap.router, prefix="/api/bootstrap", tags=["bootstrap"])
 
 @app.get("/", tags=["Root"])
 async def read_root():
     """Root endpoint to check API status"""
     return {"message": "Welcome to the Portfolio API"}
 
+@app.get("/metrics", tags=["Root"], include_in_schema=False)
+async def metrics():
+    """Request, upstream and cache metrics in the Prometheus text format"""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
 # Mount static files if needed
 # app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
 import json
 import os
 from pathlib import Path
 import re
 
+from app.core.catalog import FileSignature, WatchedFile
+
 router = APIRouter(
     prefix="/api/chatbot",
     tags=["chatbot"],
@@ -82,98 +85,190 @@ def ensure_knowledge_base():
         with open(KNOWLEDGE_BASE_PATH, "w") as f:
             json.dump(default_knowledge, f, indent=2)
 
-# Load knowledge base
-def get_knowledge_base():
-    ensure_knowledge_base()
-    try:
-        with open(KNOWLEDGE_BASE_PATH, "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading knowledge base: {e}")
-        return {}
-
-# Simple keyword-based response system
-def generate_response(message: str, knowledge_base: Dict[str, Any]) -> str:
-    message = message.lower().strip()
-    
+# Intent rules in priority order: the first rule that matches anywhere in the
+# message wins. "regex" rules search the lower-cased message, "exact" rules
+# compare the whole stripped message against a set of phrases.
+INTENT_RULES = [
     # Handle conversational phrases first
+    ("thanks", "regex", r'\b(thank|thanks|thx|ty)\b'),
+    ("goodbye", "regex", r'\b(bye|goodbye|see you|farewell)\b'),
+    ("how_are_you", "regex", r'\b(how are you|how\'s it going|how do you do|what\'s up)\b'),
+    ("yes", "exact", ("yes", "yeah", "yep", "sure")),
+    ("no", "exact", ("no", "nope", "not now")),
+    ("greeting", "regex", r'\b(hello|hi|hey|greetings|howdy)\b'),
+    ("skills", "regex", r'\b(skills?|technologies|tech stack|programming|languages|tools|frameworks|what can you do)\b'),
+    ("projects", "regex", r'\b(projects?|portfolio|work|built|developed|created|applications?|apps?)\b'),
+    ("education", "regex", r'\b(education|degree|university|college|school|academic|background|study|studied)\b'),
+    ("contact", "regex", r'\b(contact|hire|available|job|opportunity|email|reach|get in touch)\b'),
+    ("location", "regex", r'\b(location|based|live|city|country|where)\b'),
+    ("about", "regex", r'\b(about|who|tell me about|introduction|background|person|yourself)\b'),
+    ("help", "regex", r'\b(help|assist|support|what can you do|commands|options)\b'),
+]
+
+_WORD = re.compile(r'\w+')
+
+
+class IntentMatcher:
+    """
+    All intent rules and FAQ keywords compiled into one matcher.
+
+    The regex rules become a single pattern of zero-width lookaheads with
+    one named group per intent, listed in priority order. Scanning it with
+    finditer tries every position once, and at each position the highest
+    priority rule that matches there is reported, so the best match over
+    the whole message is found in one pass. FAQ keywords are a dict from
+    word to the first FAQ that uses it, looked up once per message token,
+    so matching cost does not grow with the number of FAQs.
+    """
+
+    def __init__(self, faqs: List[Dict[str, Any]]):
+        self.priority = {name: index for index, (name, _, _) in enumerate(INTENT_RULES)}
+        self.exact = {}
+        alternatives = []
+        for name, kind, rule in INTENT_RULES:
+            if kind == "exact":
+                for phrase in rule:
+                    self.exact.setdefault(phrase, name)
+            else:
+                alternatives.append(f"(?P<{name}>{rule})")
+        self.pattern = re.compile("(?=" + "|".join(alternatives) + ")")
+
+        # Significant keywords (length > 3) of each question -> first FAQ using it
+        self.faq_answers = [faq.get("answer", "") for faq in faqs]
+        self.faq_keywords: Dict[str, int] = {}
+        for index, faq in enumerate(faqs):
+            for word in _WORD.findall(faq.get("question", "").lower()):
+                if len(word) > 3:
+                    self.faq_keywords.setdefault(word, index)
+
+    def match(self, message: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Find the highest-priority intent for a lower-cased, stripped message
+
+        Returns:
+            Tuple of (intent name or None, FAQ index if no intent matched)
+        """
+        best = self.exact.get(message)
+        best_priority = self.priority[best] if best else len(INTENT_RULES)
+        for found in self.pattern.finditer(message):
+            name = found.lastgroup
+            if self.priority[name] < best_priority:
+                best, best_priority = name, self.priority[name]
+                if best_priority == 0:
+                    break
+        if best is not None:
+            return best, None
+
+        faq_index = None
+        for word in _WORD.findall(message):
+            index = self.faq_keywords.get(word)
+            if index is not None and (faq_index is None or index < faq_index):
+                faq_index = index
+        return None, faq_index
+
+
+def render_answers(knowledge_base: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Render the answer for every intent from a knowledge base
     
-    # Thank you variations
-    if re.search(r'\b(thank|thanks|thx|ty)\b', message):
-        return "You're welcome! I'm happy to help. Is there anything else you'd like to know about Onkar?"
-    
-    # Goodbye variations
-    if re.search(r'\b(bye|goodbye|see you|farewell)\b', message):
-        return "Goodbye! Feel free to chat again if you have more questions about Onkar's experience or projects."
-    
-    # How are you variations
-    if re.search(r'\b(how are you|how\'s it going|how do you do|what\'s up)\b', message):
-        return "I'm just a digital assistant, but I'm functioning well! How can I help you learn more about Onkar today?"
-    
-    # Simple yes/no
-    if message in ["yes", "yeah", "yep", "sure"]:
-        return "Great! What would you like to know? You can ask about Onkar's skills, projects, education, or work experience."
-    
-    if message in ["no", "nope", "not now"]:
-        return "Alright! Feel free to ask if you have questions later."
-    
-    # Check for greetings - more comprehensive matching
-    if re.search(r'\b(hello|hi|hey|greetings|howdy)\b', message):
-        return f"Hello! I'm an AI assistant for Onkar's portfolio. How can I help you today?"
-    
-    # Check for questions about skills - more specific matching with word boundaries
-    if re.search(r'\b(skills?|technologies|tech stack|programming|languages|tools|frameworks|what can you do)\b', message):
-        skills_response = "Onkar's key skills include:\n"
-        for skill_category in knowledge_base.get("skills", []):
-            skills_response += f"• {skill_category['category']}: {', '.join(skill_category['items'])}\n"
-        return skills_response
-    
-    # Check for questions about projects - more specific matching
-    if re.search(r'\b(projects?|portfolio|work|built|developed|created|applications?|apps?)\b', message):
-        projects_response = "Here are some of Onkar's notable projects:\n"
-        for project in knowledge_base.get("projects", []):
-            projects_response += f"• {project['title']}: {project['description']} (Technologies: {', '.join(project['technologies'])})\n"
-        return projects_response
-    
-    # Check for questions about education or background
-    if re.search(r'\b(education|degree|university|college|school|academic|background|study|studied)\b', message):
-        profile = knowledge_base.get("profile", {})
-        return f"Onkar is {profile.get('education', 'pursuing higher education')}."
-    
-    # Check for questions about contact or availability
-    if re.search(r'\b(contact|hire|available|job|opportunity|email|reach|get in touch)\b', message):
-        return "You can contact Onkar through the contact form on this website. He's currently working as a Data and DevOps Intern but is open to discussing new opportunities."
-    
-    # Check for questions about location
-    if re.search(r'\b(location|based|live|city|country|where)\b', message):
-        profile = knowledge_base.get("profile", {})
-        return f"Onkar is based in {profile.get('location', 'Boston, MA')}."
-    
-    # Check for questions about the person
-    if re.search(r'\b(about|who|tell me about|introduction|background|person|yourself)\b', message):
-        profile = knowledge_base.get("profile", {})
-        return f"{profile.get('about', 'Onkar is passionate about technology and building innovative solutions.')}"
+    Returns:
+        Dictionary mapping intent name (plus "default") to its answer
+    """
+    profile = knowledge_base.get("profile", {})
     
-    # Help command
-    if re.search(r'\b(help|assist|support|what can you do|commands|options)\b', message):
-        return "I can answer questions about Onkar's:\n• Skills and technologies\n• Projects and portfolio\n• Education and background\n• Contact information\n• Location\nJust ask me anything you'd like to know!"
+    skills_response = "Onkar's key skills include:\n"
+    for skill_category in knowledge_base.get("skills", []):
+        skills_response += f"• {skill_category['category']}: {', '.join(skill_category['items'])}\n"
     
-    # Check for FAQs - using more careful matching to avoid false positives
-    for faq in knowledge_base.get("faqs", []):
-        question = faq.get("question", "").lower()
-        # Split the question into keywords and check if any significant keywords (length > 3) are in the message
-        keywords = [word for word in question.split() if len(word) > 3]
-        if any(re.search(r'\b' + re.escape(keyword) + r'\b', message) for keyword in keywords):
-            return faq.get("answer", "")
+    projects_response = "Here are some of Onkar's notable projects:\n"
+    for project in knowledge_base.get("projects", []):
+        projects_response += f"• {project['title']}: {project['description']} (Technologies: {', '.join(project['technologies'])})\n"
     
-    # Default response
-    return "I don't have specific information about that. Feel free to ask about Onkar's skills, projects, education, or contact information. You can also try rephrasing your question."
+    return {
+        "thanks": "You're welcome! I'm happy to help. Is there anything else you'd like to know about Onkar?",
+        "goodbye": "Goodbye! Feel free to chat again if you have more questions about Onkar's experience or projects.",
+        "how_are_you": "I'm just a digital assistant, but I'm functioning well! How can I help you learn more about Onkar today?",
+        "yes": "Great! What would you like to know? You can ask about Onkar's skills, projects, education, or work experience.",
+        "no": "Alright! Feel free to ask if you have questions later.",
+        "greeting": "Hello! I'm an AI assistant for Onkar's portfolio. How can I help you today?",
+        "skills": skills_response,
+        "projects": projects_response,
+        "education": f"Onkar is {profile.get('education', 'pursuing higher education')}.",
+        "contact": "You can contact Onkar through the contact form on this website. He's currently working as a Data and DevOps Intern but is open to discussing new opportunities.",
+        "location": f"Onkar is based in {profile.get('location', 'Boston, MA')}.",
+        "about": f"{profile.get('about', 'Onkar is passionate about technology and building innovative solutions.')}",
+        "help": "I can answer questions about Onkar's:\n• Skills and technologies\n• Projects and portfolio\n• Education and background\n• Contact information\n• Location\nJust ask me anything you'd like to know!",
+        "default": "I don't have specific information about that. Feel free to ask about Onkar's skills, projects, education, or contact information. You can also try rephrasing your question.",
+    }
+
+
+class KnowledgeBaseSnapshot:
+    """A knowledge base with its intent matcher compiled and answers rendered"""
+
+    __slots__ = ("signature", "version", "data", "matcher", "answers")
+
+    def __init__(self, signature: Optional[FileSignature], version: str, data: Dict[str, Any]):
+        self.signature = signature
+        self.version = version
+        self.data = data
+        self.matcher = IntentMatcher(data.get("faqs", []))
+        self.answers = render_answers(data)
+
+    def respond(self, message: str) -> str:
+        """Answer a message: one matcher pass plus a dict lookup"""
+        intent, faq_index = self.matcher.match(message.lower().strip())
+        if intent is not None:
+            return self.answers[intent]
+        if faq_index is not None:
+            return self.matcher.faq_answers[faq_index]
+        return self.answers["default"]
+
+
+class KnowledgeBaseStore(WatchedFile):
+    """Knowledge base file kept in memory and re-rendered when its mtime changes"""
+
+    def _stat(self) -> Optional[FileSignature]:
+        signature = super()._stat()
+        if signature is None:
+            ensure_knowledge_base()
+            signature = super()._stat()
+        return signature
+
+    def _build(self, signature: Optional[FileSignature]) -> KnowledgeBaseSnapshot:
+        with open(self.file_path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        try:
+            return KnowledgeBaseSnapshot(signature, hashlib.sha256(raw).hexdigest()[:16], data)
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"Malformed knowledge base: {e!r}") from e
+
+    def _empty(self) -> KnowledgeBaseSnapshot:
+        return KnowledgeBaseSnapshot(None, "empty", {})
+
+    def get(self) -> KnowledgeBaseSnapshot:
+        """Get the current knowledge base snapshot"""
+        return super().get()
+
+
+knowledge_base_store = KnowledgeBaseStore(KNOWLEDGE_BASE_PATH)
+
+# Load knowledge base
+def get_knowledge_base():
+    return knowledge_base_store.get().data
+
+# Simple keyword-based response system
+def generate_response(message: str, knowledge_base: Dict[str, Any]) -> str:
+    snapshot = knowledge_base_store.get()
+    if snapshot.data is not knowledge_base:
+        # Not the stored knowledge base: compile and render it for this call only
+        snapshot = KnowledgeBaseSnapshot(None, "adhoc", knowledge_base)
+    return snapshot.respond(message)
 
 @router.post("", response_model=ChatbotResponse)
 async def chat(request: ChatbotRequest):
     try:
-        knowledge_base = get_knowledge_base()
-        response = generate_response(request.message, knowledge_base)
+        response = knowledge_base_store.get().respond(request.message)
         return ChatbotResponse(response=response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, FrozenSet, Optional, Set, Tuple
+
+from app.utils.text import char_ngrams, normalize_question, question_words
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of chat answers keyed by normalized question.
+
+    Exact hits are a dict lookup on the normalized form. When
+    similarity_threshold is above 0, a miss falls back to near-duplicate
+    matching: candidates sharing character trigrams are found through an
+    inverted index and the best one asking with the same question words is
+    used if its Jaccard similarity reaches the threshold, so paraphrases
+    reuse a cached answer too.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, similarity_threshold: float = 0.0):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        # key -> (expires_at, value, ngrams), oldest first
+        self._entries: "OrderedDict[str, Tuple[float, Any, FrozenSet[str]]]" = OrderedDict()
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, grams = self._entries.pop(key)
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+
+    def _live(self, key: str, now: float) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _nearest(self, query: str) -> Optional[str]:
+        grams = char_ngrams(query)
+        asked = question_words(query)
+        overlaps: Counter = Counter()
+        for gram in grams:
+            overlaps.update(self._postings.get(gram, ()))
+        best_key, best_score = None, 0.0
+        for key, overlap in overlaps.items():
+            # A paraphrase must ask the same thing: "when ..." never reuses "where ..."
+            if question_words(key) != asked:
+                continue
+            other = self._entries[key][2]
+            score = overlap / (len(grams) + len(other) - overlap)
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key if best_score >= self.similarity_threshold else None
+
+    def get(self, message: str) -> Optional[Any]:
+        """
+        Look up the cached answer for a message
+
+        Args:
+            message: Raw user message
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        key = normalize_question(message)
+        now = time.monotonic()
+        with self._lock:
+            value = self._live(key, now)
+            if value is not None:
+                self.hits += 1
+                return value
+            if self.similarity_threshold > 0 and self._entries:
+                near_key = self._nearest(key)
+                if near_key is not None:
+                    value = self._live(near_key, now)
+                    if value is not None:
+                        self.near_hits += 1
+                        return value
+            self.misses += 1
+            return None
+
+    def set(self, message: str, value: Any) -> None:
+        """
+        Store an answer, evicting the least recently used entry if full
+
+        Args:
+            message: Raw user message the answer belongs to
+            value: Answer to cache
+        """
+        key = normalize_question(message)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            grams = char_ngrams(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, grams)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.near_hits) / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
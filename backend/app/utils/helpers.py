@@ -1,5 +1,6 @@
 import json
 import os
+import tempfile
 from pathlib import Path
 from typing import List, Dict, Any, Union
 
@@ -27,6 +28,10 @@ def save_data_to_json(file_path: str, data: List[Dict[str, Any]]) -> bool:
     """
     Save data to a JSON file
     
+    The data is written to a temporary file in the same directory, fsynced
+    and renamed over the target, so readers see the old or the new file,
+    never a partly written one.
+    
     Args:
         file_path: Path to the JSON file
         data: List of dictionaries to save
@@ -40,8 +45,16 @@ def save_data_to_json(file_path: str, data: List[Dict[str, Any]]) -> bool:
         if directory and not os.path.exists(directory):
             os.makedirs(directory)
             
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2)
+        fd, tmp_path = tempfile.mkstemp(dir=directory or ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         return True
     except Exception as e:
         print(f"Error saving data: {e}")
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Encode a payload the same way FastAPI's JSONResponse does
+
+    Args:
+        payload: Any value accepted by jsonable_encoder (pydantic models included)
+
+    Returns:
+        Compact UTF-8 JSON bytes
+    """
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+
+    Args:
+        request: Incoming request
+        etag: Quoted entity tag of the current representation
+
+    Returns:
+        True if the client already holds this representation
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class PreserializedResponseCache:
+    """
+    Per-endpoint cache of encoded response bodies.
+
+    Each key holds the body for one data version together with a strong
+    ETag derived from the bytes. The payload is only built and encoded
+    when the version changes; every other request is a dict lookup plus
+    an If-None-Match comparison.
+    """
+
+    def __init__(self, cache_control: str):
+        self.cache_control = cache_control
+        self._entries: Dict[str, Tuple[str, bytes, str]] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.not_modified = 0
+
+    def get_body(self, key: str, version: str, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        """
+        Get the encoded body and ETag for a key, building it if stale
+
+        Args:
+            key: Cache key, usually the endpoint name
+            version: Version of the data the payload is built from
+            build: Callable returning the payload for that version, or its
+                already encoded JSON (bytes or a memoryview)
+
+        Returns:
+            Tuple of (body bytes, quoted ETag)
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                payload = build()
+                if isinstance(payload, memoryview):
+                    # Points into a shared snapshot; copied once per version since
+                    # responses need bytes of their own
+                    body = bytes(payload)
+                elif isinstance(payload, bytes):
+                    body = payload
+                else:
+                    body = encode_json(payload)
+                self.builds += 1
+                etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+                entry = (version, body, etag)
+                self._entries[key] = entry
+        return entry[1], entry[2]
+
+    def respond(self, request: Request, key: str, version: str, build: Callable[[], Any]) -> Response:
+        """
+        Build a JSON response, or a bodiless 304 if the client's copy is current
+
+        Args:
+            request: Incoming request, used for If-None-Match
+            key: Cache key, usually the endpoint name
+            version: Version of the data the payload is built from
+            build: Callable returning the payload for that version
+
+        Returns:
+            A 200 response with the cached body or a 304 response
+        """
+        body, etag = self.get_body(key, version, build)
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if etag_matches(request, etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+response_cache = PreserializedResponseCache(
+    cache_control=f"public, max-age={settings.CACHE_MAX_AGE}, must-revalidate"
+)
+
+registry.collector(
+    "http_response_cache_events_total", "counter", "Pre-serialized response bodies rebuilt and 304s served",
+    lambda: [({"event": "build"}, response_cache.builds), ({"event": "not_modified"}, response_cache.not_modified)],
+)
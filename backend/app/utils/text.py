@@ -0,0 +1,75 @@
+import re
+from typing import FrozenSet, List
+
+# Words that carry no meaning for matching questions about the portfolio
+STOP_WORDS = frozenset("""
+a an the and or but of to in on at for with about from by as is are was were be been
+do does did can could would should will shall may might must i me my you your yours
+he him his she her it its we us our they them their this that these those what which
+who whom whose how when where why please tell show give know let lets some any all
+there here so just also very really much many more most have has had get got like
+""".split())
+
+# Question words: they decide what is being asked ("where" vs "when"), so cache
+# keys keep them even though retrieval drops them
+INTERROGATIVES = frozenset("what which who whom whose how when where why".split())
+
+_CACHE_STOP_WORDS = STOP_WORDS - INTERROGATIVES
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_question(message: str) -> str:
+    """
+    Reduce a chat message to a canonical form for cache lookups
+
+    Case-folds, strips punctuation and extra whitespace and removes stop
+    words other than question words, so "What are your skills?" and
+    "what skills" normalize the same while "Where did you study?" and
+    "When did you study?" stay apart. If only stop words remain, they are
+    kept rather than returning "".
+
+    Args:
+        message: Raw user message
+
+    Returns:
+        Space-separated normalized tokens
+    """
+    tokens = _NON_WORD.sub(" ", message.casefold()).split()
+    meaningful = [token for token in tokens if token not in _CACHE_STOP_WORDS]
+    return " ".join(meaningful or tokens)
+
+
+def question_words(normalized: str) -> FrozenSet[str]:
+    """The interrogatives in a normalize_question() result"""
+    return frozenset(token for token in normalized.split() if token in INTERROGATIVES)
+
+
+def char_ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    """
+    Character n-grams of a normalized string, used for near-duplicate matching
+
+    Args:
+        text: Normalized text
+        n: Gram length
+
+    Returns:
+        Set of n-grams (the padded text itself if shorter than n)
+    """
+    padded = f" {text} "
+    if len(padded) <= n:
+        return frozenset([padded])
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into case-folded word tokens without stop words
+
+    Args:
+        text: Any text
+
+    Returns:
+        List of tokens in order, duplicates kept
+    """
+    return [token for token in _NON_WORD.sub(" ", text.casefold()).split() if token not in STOP_WORDS]
@@ -0,0 +1 @@
+"""Stand-alone performance checks, run as ``python -m benchmarks.<name>`` from backend/"""
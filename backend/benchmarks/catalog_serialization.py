@@ -0,0 +1,110 @@
+"""
+Catalog serialization micro-benchmark
+
+Compares the per-request cost of the old /projects path (build a Project
+per item, then FastAPI re-validates the list against
+response_model=List[Project] and encodes it) with the current one
+(items validated and encoded once at catalog load, response assembled
+from the pre-encoded bytes), at several catalog sizes. Both run as real
+FastAPI routes in-process; the response cache is not involved.
+
+Usage (from backend/):
+    python -m benchmarks.catalog_serialization [--sizes 10 1000 10000] [--repeat 20]
+"""
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.catalog import JsonCatalog, _featured_projects
+from app.core.models import Project
+from app.core.project_query import ProjectQueryIndex
+
+TECH = ["Python", "FastAPI", "Docker", "AWS", "React", "PostgreSQL", "Terraform", "Kubernetes"]
+
+
+def make_projects(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "title": f"Project {i}",
+            "description": "A synthetic project used to benchmark catalog serialization. " * 3,
+            "image_url": f"/assets/projects/{i}.jpg",
+            "project_url": None,
+            "github_url": f"https://github.com/example/project-{i}",
+            "tech_stack": [TECH[(i + k) % len(TECH)] for k in range(4)],
+            "start_date": f"20{10 + i % 14:02d}-{1 + i % 12:02d}-01",
+            "end_date": None if i % 5 == 0 else f"20{11 + i % 14:02d}-{1 + i % 12:02d}-15",
+            "is_featured": i % 7 == 0,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def build_app(catalog: JsonCatalog, raw_items: List[Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/old", response_model=List[Project])
+    async def old_path():
+        return [Project(**project) for project in raw_items]
+
+    @app.get("/new", response_model=List[Project])
+    async def new_path():
+        snapshot = catalog.get()
+        return Response(content=snapshot.encode_list(snapshot.items), media_type="application/json")
+
+    return app
+
+
+def time_requests(client: TestClient, path: str, repeat: int) -> List[float]:
+    client.get(path)  # warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    return samples
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20, help="requests timed per path and size")
+    args = parser.parse_args(argv)
+
+    print(f"{'projects':>9} {'load ms':>9} {'old p50 ms':>11} {'new p50 ms':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            raw_items = make_projects(size)
+            path = Path(tmp) / f"projects_{size}.json"
+            path.write_text(json.dumps(raw_items))
+            catalog = JsonCatalog(
+                path,
+                index_builders={"featured": _featured_projects, "query": ProjectQueryIndex},
+                model=Project,
+            )
+            started = time.perf_counter()
+            snapshot = catalog.get()
+            load_ms = (time.perf_counter() - started) * 1000
+
+            client = TestClient(build_app(catalog, raw_items))
+            old_body = client.get("/old").content
+            if old_body != client.get("/new").content:
+                print(f"Bodies differ at {size} projects", file=sys.stderr)
+                return 1
+            old = statistics.median(time_requests(client, "/old", args.repeat))
+            new = statistics.median(time_requests(client, "/new", args.repeat))
+            print(f"{len(snapshot.items):>9} {load_ms:>9.1f} {old:>11.2f} {new:>11.2f} {old / new:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Chatbot intent accuracy and latency benchmark
+
+Runs the labeled questions in chatbot_corpus.json through both keyword
+engines and reports, per engine, the share routed to the expected intent,
+a confusion matrix (expected rows, answered columns), the misrouted
+questions and per-call latency percentiles:
+
+  fallback  get_fallback_response, the /api/chatbot/chat answer when Gemini
+            is unavailable
+  rules     generate_response, the /api/chatbot knowledge-base answer
+  chat      answer_chat_message end to end with Gemini replaced by a local
+            stub (latency and answer source only; the stub has no intents)
+
+An answer is mapped back to its intent through the engine's answer table,
+since every intent has one fixed answer. A question whose label for an
+engine is null is skipped by that engine. The run fails when an engine's
+accuracy drops below, or its p95 latency rises above, the thresholds in
+chatbot_thresholds.json.
+
+Latency ceilings are ratios to a baseline: the median time of a fixed
+pure-Python workload, measured at the start of the run, so they hold on
+slower machines. They sit 4-5x above the ratios measured when they
+were set. The accuracy floors sit about 4 questions per engine below the
+measured accuracy (72.7% fallback, 89.8% rules), so relabeling or adding
+a question does not fail the run.
+
+Usage (from backend/):
+    python -m benchmarks.chatbot_accuracy [--repeat 200] [--stub-latency-ms 0] [--engines fallback rules chat]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.api.routes import chatbot
+from app.core.circuit_breaker import percentile
+from app.core.clients import google_clients
+from app.routers.chatbot import generate_response, knowledge_base_store
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+CORPUS_FILE = BENCHMARK_DIR / "chatbot_corpus.json"
+THRESHOLDS_FILE = BENCHMARK_DIR / "chatbot_thresholds.json"
+
+ENGINES = ("fallback", "rules", "chat")
+STUB_PREFIX = "[stub]"
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGeminiModel:
+    """Stand-in for the Gemini model: the same prompt always gets the same answer"""
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    async def generate_content_async(self, prompt: str, stream: bool = False) -> StubResponse:
+        self.calls += 1
+        await asyncio.sleep(self.latency_seconds)
+        return StubResponse(f"{STUB_PREFIX} {hashlib.sha256(prompt.encode()).hexdigest()[:16]}")
+
+
+def calibrate(rounds: int = 500) -> float:
+    """Median time in microseconds of a fixed workload, the unit of the latency ceilings"""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        sum(i * i for i in range(1000))
+        timings.append((time.perf_counter() - start) * 1e6)
+    return percentile(sorted(timings), 0.5)
+
+
+def time_calls(messages: List[str], answer: Callable[[str], str], repeat: int) -> Tuple[List[str], List[float]]:
+    """
+    Answer every message ``repeat`` times
+
+    Returns:
+        Tuple of (answer to each message, every call's latency in microseconds)
+    """
+    answers = [answer(message) for message in messages]
+    latencies: List[float] = []
+    for _ in range(repeat):
+        for message in messages:
+            start = time.perf_counter()
+            answer(message)
+            latencies.append((time.perf_counter() - start) * 1e6)
+    return answers, latencies
+
+
+async def time_chat(messages: List[str], repeat: int) -> Tuple[List[str], List[float]]:
+    """Like time_calls for answer_chat_message, with the answer cache emptied before every call"""
+    answers: List[str] = []
+    latencies: List[float] = []
+    for round_index in range(repeat + 1):
+        for message in messages:
+            chatbot.response_cache.clear()
+            start = time.perf_counter()
+            result = await chatbot.answer_chat_message(message)
+            elapsed = (time.perf_counter() - start) * 1e6
+            if round_index == 0:
+                answers.append(result["response"])
+            else:
+                latencies.append(elapsed)
+    return answers, latencies
+
+
+def confusion_matrix(expected: List[str], predicted: List[str], labels: List[str]) -> str:
+    """Render expected (rows) x predicted (columns) counts over the labels that occur"""
+    counts = Counter(zip(expected, predicted))
+    used = [label for label in labels if label in expected or label in predicted]
+    width = max(len(label) for label in used)
+    lines = [" " * (width + 2) + " ".join(f"{label[:6]:>6}" for label in used)]
+    for row in used:
+        if row not in expected:
+            continue
+        cells = " ".join(f"{counts[(row, column)] or '.':>6}" for column in used)
+        lines.append(f"  {row:<{width}} {cells}")
+    return "\n".join(lines)
+
+
+def report_latency(name: str, latencies: List[float], baseline: float) -> float:
+    """Print latency percentiles and return the p95 as a ratio to the baseline"""
+    ordered = sorted(latencies)
+    p50, p95, p99 = (percentile(ordered, fraction) for fraction in (0.5, 0.95, 0.99))
+    print(f"  latency over {len(ordered)} calls: p50 {p50:.1f} us, p95 {p95:.1f} us "
+          f"({p95 / baseline:.2f}x baseline), p99 {p99:.1f} us, max {ordered[-1]:.1f} us")
+    return p95 / baseline
+
+
+def check(name: str, thresholds: Dict[str, float], accuracy: Optional[float], p95_ratio: float) -> List[str]:
+    """Threshold violations of one engine"""
+    failures = []
+    if accuracy is not None and accuracy < thresholds.get("min_accuracy", 0.0):
+        failures.append(f"{name}: accuracy {accuracy:.1%} is below {thresholds['min_accuracy']:.1%}")
+    if p95_ratio > thresholds.get("max_p95_ratio", float("inf")):
+        failures.append(f"{name}: p95 latency {p95_ratio:.2f}x baseline exceeds {thresholds['max_p95_ratio']}x")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    corpus = json.loads(CORPUS_FILE.read_text())
+    thresholds = json.loads(THRESHOLDS_FILE.read_text())
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="timed passes over the corpus per engine")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="simulated Gemini latency for the chat engine")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    args = parser.parse_args(argv)
+
+    baseline = calibrate()
+    print(f"baseline: {baseline:.1f} us per reference workload")
+    questions = corpus["questions"]
+    # Each intent has one fixed answer, so an answer identifies the intent it was given for
+    snapshot = knowledge_base_store.get()
+    rules_intents = {text: intent for intent, text in snapshot.answers.items()}
+    rules_intents.update({text: "faq" for text in snapshot.matcher.faq_answers})
+    fallback_intents = {text: key for key, text in chatbot.FALLBACK_RESPONSES.items()}
+    classifiers = {
+        "fallback": (chatbot.get_fallback_response, fallback_intents),
+        "rules": (lambda message: generate_response(message, snapshot.data), rules_intents),
+    }
+
+    failures: List[str] = []
+    for name in args.engines:
+        if name == "chat":
+            continue
+        answer, intents = classifiers[name]
+        labeled = [(question["message"], question[name]) for question in questions if question.get(name)]
+        messages = [message for message, _ in labeled]
+        expected = [label for _, label in labeled]
+        answers, latencies = time_calls(messages, answer, args.repeat)
+        predicted = [intents.get(text, "unknown") for text in answers]
+        correct = sum(e == p for e, p in zip(expected, predicted))
+        accuracy = correct / len(labeled)
+
+        print(f"\n{name}: {correct}/{len(labeled)} questions routed to the expected intent ({accuracy:.1%})")
+        print(confusion_matrix(expected, predicted, corpus["labels"][name] + ["unknown"]))
+        misrouted = [(m, e, p) for m, e, p in zip(messages, expected, predicted) if e != p]
+        if misrouted:
+            print("  misrouted:")
+            for message, want, got in misrouted:
+                print(f"    {message!r}: expected {want}, got {got}")
+        p95_ratio = report_latency(name, latencies, baseline)
+        failures += check(name, thresholds.get(name, {}), accuracy, p95_ratio)
+
+    if "chat" in args.engines:
+        stub = StubGeminiModel(args.stub_latency_ms / 1000)
+        google_clients._gemini_model = stub
+        google_clients._gemini_configured = True
+        chatbot.gemini_available = True
+        messages = [question["message"] for question in questions]
+        answers, latencies = asyncio.run(time_chat(messages, args.repeat))
+
+        fallback_texts = set(chatbot.FALLBACK_RESPONSES.values())
+        sources = Counter(
+            "gemini" if text.startswith(STUB_PREFIX) else "fallback" if text in fallback_texts else "retrieval"
+            for text in answers
+        )
+        print(f"\nchat: {len(messages)} questions, answered by "
+              + ", ".join(f"{source} {count}" for source, count in sources.most_common())
+              + f" ({stub.calls} stub Gemini calls)")
+        p95_ratio = report_latency("chat", latencies, baseline)
+        failures += check("chat", thresholds.get("chat", {}), None, p95_ratio)
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
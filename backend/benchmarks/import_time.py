@@ -0,0 +1,85 @@
+"""
+Import-time benchmark for the API
+
+Imports the app in fresh interpreters with ``python -X importtime`` and
+fails when the median cumulative import time exceeds the budget in
+import_budget.json, or when a module that should load lazily (the Google
+SDKs, NumPy) is imported at startup.
+
+Usage (from backend/):
+    python -m benchmarks.import_time [--runs 5] [--top 15] [--budget-ms N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "import_budget.json"
+
+
+def measure(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        Mapping of every imported module to (self, cumulative) microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # column header
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    budget = json.loads(BUDGET_FILE.read_text())
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time (median is used)")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=budget["budget_ms"])
+    args = parser.parse_args(argv)
+
+    module = budget["module"]
+    runs = [measure(module) for _ in range(args.runs)]
+    totals_ms = [run[module][1] / 1000 for run in runs]
+    median_ms = statistics.median(totals_ms)
+
+    print(f"{module}: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {min(totals_ms):.0f}, max {max(totals_ms):.0f}), budget {args.budget_ms:.0f} ms")
+    print("\nSlowest modules by self time (last run):")
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    failed = False
+    eager = [name for name in budget["forbidden_modules"] if name in runs[-1]]
+    if eager:
+        print(f"\nFAIL: imported at startup but should load lazily: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"\nFAIL: import time {median_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("\nOK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""
+In-process HTTP load testing for the API
+
+Runs app.main with Gemini and Google Sheets replaced by local fakes
+(fakes.py) and drives weighted traffic mixes (mixes.json) against it.
+See __main__.py for usage.
+"""
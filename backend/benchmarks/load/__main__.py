@@ -0,0 +1,354 @@
+"""
+HTTP load test of the API with local Gemini and Sheets fakes
+
+Starts app.main in this process, either behind httpx's ASGI transport
+(no sockets; measures the app itself) or under uvicorn on a localhost
+port (adds HTTP parsing and the network stack). Gemini and Google Sheets
+are replaced by the fakes in fakes.py, the catalog database and contact
+spool live in a temporary directory, and the per-client rate limits are
+lifted (the in-flight caps stay), so nothing outside the machine is
+touched and every request reaches its route.
+
+Each run drives one traffic mix from mixes.json with a fixed number of
+concurrent clients, each sending its next request as soon as the last
+one finished, for a warm-up period and then a measured period. Request
+templates may use "{question}" (a random question from
+benchmarks/chatbot_corpus.json) and "{n}" (a request counter) in JSON
+string values. The report is JSON: per run and endpoint, the request
+count, status codes, throughput and p50/p95/p99 latency in milliseconds,
+plus the commit and settings it was measured with. Pass an earlier
+report to --compare to print the p95 change per endpoint.
+
+Usage (from backend/):
+    python -m benchmarks.load [--mode asgi|uvicorn] [--mix all] [--concurrency 1 8 32]
+        [--duration 10] [--warmup 2] [--gemini-latency-ms 800] [--gemini-error-rate 0.02]
+        [--sheets-latency-ms 300] [--sheets-error-rate 0.05] [--output report.json]
+        [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.load.fakes import FakeGeminiModel, FakeSheetsService, LatencyModel, install
+
+BENCHMARK_DIR = Path(__file__).resolve().parent.parent
+BACKEND_DIR = BENCHMARK_DIR.parent
+MIXES_FILE = Path(__file__).resolve().parent / "mixes.json"
+CORPUS_FILE = BENCHMARK_DIR / "chatbot_corpus.json"
+
+# Lifted so one load generator is not throttled as a single client
+UNLIMITED_RATE = str(10 ** 9)
+
+
+def configure_environment(data_dir: Path, admin_token: str, keep_rate_limits: bool) -> None:
+    """Settings for the app under test; must run before anything imports app.core.config"""
+    os.environ["GEMINI_API_KEY"] = "fake-gemini-key"
+    os.environ["ADMIN_TOKEN"] = admin_token
+    os.environ["CATALOG_DB_PATH"] = str(data_dir / "catalog.sqlite3")
+    os.environ["CATALOG_SNAPSHOT_DIR"] = str(data_dir / "snapshots")
+    os.environ["CONTACT_SPOOL_PATH"] = str(data_dir / "contact_spool.sqlite3")
+    if not keep_rate_limits:
+        for name in ("CHAT_RATE_PER_MINUTE", "CHAT_BURST", "CONTACT_RATE_PER_MINUTE", "CONTACT_BURST"):
+            os.environ[name] = UNLIMITED_RATE
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, with "-dirty" if it has uncommitted changes"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+class RequestFactory:
+    """Builds concrete requests from the templates of a traffic mix"""
+
+    def __init__(self, templates: List[Dict[str, Any]], questions: List[str], admin_token: str, seed: int):
+        self.templates = templates
+        self.weights = [template.get("weight", 1) for template in templates]
+        self.questions = questions
+        self.admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        self.random = random.Random(seed)
+        self.counter = 0
+        self.ndjson: Dict[str, bytes] = {}
+
+    def _fill(self, value: Any) -> Any:
+        if isinstance(value, str):
+            if "{question}" in value:
+                value = value.replace("{question}", self.random.choice(self.questions))
+            return value.replace("{n}", str(self.counter))
+        if isinstance(value, list):
+            return [self._fill(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._fill(item) for key, item in value.items()}
+        return value
+
+    def _catalog_ndjson(self, name: str) -> bytes:
+        """The catalog's current JSON file as an NDJSON import body"""
+        if name not in self.ndjson:
+            from app.utils.helpers import get_data_dir
+
+            items = json.loads((get_data_dir() / f"{name}.json").read_text())
+            self.ndjson[name] = b"".join(json.dumps(item).encode() + b"\n" for item in items)
+        return self.ndjson[name]
+
+    def next(self) -> Tuple[str, Dict[str, Any]]:
+        """Pick a template by weight; returns (endpoint name, httpx request arguments)"""
+        self.counter += 1
+        template = self.random.choices(self.templates, weights=self.weights)[0]
+        request: Dict[str, Any] = {"method": template["method"], "url": template["path"]}
+        headers: Dict[str, str] = dict(self.admin_headers) if template.get("admin") else {}
+        if "json" in template:
+            request["json"] = self._fill(template["json"])
+        if "ndjson" in template:
+            request["content"] = self._catalog_ndjson(template["ndjson"])
+            headers["Content-Type"] = "application/x-ndjson"
+        if headers:
+            request["headers"] = headers
+        return template["name"], request
+
+
+class Sample:
+    __slots__ = ("endpoint", "status", "latency")
+
+    def __init__(self, endpoint: str, status: str, latency: float):
+        self.endpoint = endpoint
+        self.status = status
+        self.latency = latency
+
+
+async def drive(
+    client: httpx.AsyncClient, factory: RequestFactory, concurrency: int, warmup: float, duration: float
+) -> List[Sample]:
+    """
+    Run ``concurrency`` closed-loop clients for warmup + duration seconds
+
+    Returns:
+        Samples of the requests started during the measured period
+    """
+    loop = asyncio.get_running_loop()
+    measure_from = loop.time() + warmup
+    stop_at = measure_from + duration
+    samples: List[Sample] = []
+
+    async def client_loop() -> None:
+        while True:
+            started = loop.time()
+            if started >= stop_at:
+                return
+            endpoint, request = factory.next()
+            try:
+                response = await client.request(**request)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if started >= measure_from:
+                samples.append(Sample(endpoint, status, loop.time() - started))
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return samples
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, Any]:
+    """Throughput, status counts and latency percentiles (ms) per endpoint and overall"""
+    from app.core.circuit_breaker import percentile
+
+    def stats(group: List[Sample]) -> Dict[str, Any]:
+        latencies = sorted(sample.latency * 1000 for sample in group)
+        statuses = Counter(sample.status for sample in group)
+        return {
+            "requests": len(group),
+            "errors": sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 500),
+            "statuses": dict(sorted(statuses.items())),
+            "throughput_rps": round(len(group) / duration, 2),
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    by_endpoint: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+    return {
+        "total": stats(samples),
+        "endpoints": {name: stats(group) for name, group in sorted(by_endpoint.items())},
+    }
+
+
+@asynccontextmanager
+async def asgi_client(app: Any) -> AsyncIterator[httpx.AsyncClient]:
+    """Client calling the app directly, with its startup and shutdown handlers run around it"""
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(app: Any, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Client talking HTTP to the app served by uvicorn on a free localhost port, in a thread"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="on"))
+    thread = threading.Thread(target=server.run, name="uvicorn", daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            await asyncio.sleep(0.05)
+        port = server.servers[0].sockets[0].getsockname()[1]
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await asyncio.to_thread(thread.join, 10)
+
+
+async def run_all(args: argparse.Namespace, admin_token: str, gemini: FakeGeminiModel) -> List[Dict[str, Any]]:
+    from app.main import app
+
+    mixes = json.loads(MIXES_FILE.read_text())
+    questions = [question["message"] for question in json.loads(CORPUS_FILE.read_text())["questions"]]
+    runs = []
+    # One app instance serves every run, so caches stay warm from one run to the next
+    if args.mode == "asgi":
+        client_context = asgi_client(app)
+    else:
+        client_context = uvicorn_client(app, max(args.concurrency))
+    async with client_context as client:
+        for mix in args.mix:
+            for concurrency in args.concurrency:
+                factory = RequestFactory(mixes[mix], questions, admin_token, args.seed)
+                gemini_calls = gemini.calls
+                samples = await drive(client, factory, concurrency, args.warmup, args.duration)
+                summary = summarize(samples, args.duration)
+                runs.append({
+                    "mix": mix,
+                    "concurrency": concurrency,
+                    "gemini_calls": gemini.calls - gemini_calls,
+                    **summary,
+                })
+                total = summary["total"]
+                print(
+                    f"{mix} x{concurrency}: {total['requests']} requests, {total['throughput_rps']} req/s, "
+                    f"p50 {total['p50_ms']} ms, p95 {total['p95_ms']} ms, p99 {total['p99_ms']} ms, "
+                    f"{total['errors']} errors",
+                    file=sys.stderr,
+                )
+    return runs
+
+
+def _settings(value: Any) -> Any:
+    """A report field without the call counters, which differ on every run"""
+    if isinstance(value, dict):
+        return {key: _settings(item) for key, item in value.items() if key not in ("calls", "failures", "rows_appended")}
+    return value
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the p95 change of every endpoint measured in both reports"""
+    print(f"\np95 vs {baseline.get('commit') or 'baseline'}:", file=sys.stderr)
+    for key in ("mode", "duration_seconds", "fakes"):
+        if baseline.get(key) is not None and _settings(baseline[key]) != _settings(report[key]):
+            print(f"  note: {key} differs from the baseline", file=sys.stderr)
+    before = {(run["mix"], run["concurrency"]): run for run in baseline.get("runs", [])}
+    for run in report["runs"]:
+        old = before.get((run["mix"], run["concurrency"]))
+        if old is None:
+            continue
+        print(f"  {run['mix']} x{run['concurrency']}", file=sys.stderr)
+        for name, stats in [("total", run["total"])] + list(run["endpoints"].items()):
+            previous = old["total"] if name == "total" else old["endpoints"].get(name)
+            if not previous or not previous["p95_ms"]:
+                continue
+            change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"]
+            print(f"    {name:<24} {previous['p95_ms']:>10.2f} -> {stats['p95_ms']:>10.2f} ms  {change:+.0%}",
+                  file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    mixes = json.loads(MIXES_FILE.read_text())
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--mix", nargs="+", choices=sorted(mixes), default=["all"], help="traffic mixes from mixes.json")
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[8], help="concurrent clients (one run per value)")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each run")
+    parser.add_argument("--gemini-latency-ms", type=float, default=800.0)
+    parser.add_argument("--gemini-jitter-ms", type=float, default=400.0)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.02)
+    parser.add_argument("--sheets-latency-ms", type=float, default=300.0)
+    parser.add_argument("--sheets-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--sheets-error-rate", type=float, default=0.05)
+    parser.add_argument("--keep-rate-limits", action="store_true", help="leave the per-client rate limits on")
+    parser.add_argument("--seed", type=int, default=0, help="seed for request selection and the fakes")
+    parser.add_argument("--log-level", default="CRITICAL", help="app log level (injected failures log errors)")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", type=Path, help="earlier report to compare p95 latencies against")
+    args = parser.parse_args(argv)
+
+    admin_token = secrets.token_urlsafe(16)
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as data_dir:
+        configure_environment(Path(data_dir), admin_token, args.keep_rate_limits)
+        gemini = FakeGeminiModel(LatencyModel(args.gemini_latency_ms, args.gemini_jitter_ms, args.gemini_error_rate, args.seed))
+        sheets = FakeSheetsService(LatencyModel(args.sheets_latency_ms, args.sheets_jitter_ms, args.sheets_error_rate, args.seed))
+        install(gemini, sheets)
+
+        import logging
+        import app.main  # noqa: F401  (configures logging, overridden below)
+
+        logging.getLogger().setLevel(args.log_level.upper())
+        runs = asyncio.run(run_all(args, admin_token, gemini))
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "mode": args.mode,
+        "duration_seconds": args.duration,
+        "warmup_seconds": args.warmup,
+        "seed": args.seed,
+        "rate_limits": "kept" if args.keep_rate_limits else "lifted",
+        "fakes": {
+            "gemini": {"latency_ms": args.gemini_latency_ms, "jitter_ms": args.gemini_jitter_ms,
+                       "error_rate": args.gemini_error_rate, **gemini.stats()},
+            "sheets": {"latency_ms": args.sheets_latency_ms, "jitter_ms": args.sheets_jitter_ms,
+                       "error_rate": args.sheets_error_rate, **sheets.stats()},
+        },
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Local stand-ins for the Google upstreams
+
+FakeGeminiModel and FakeSheetsService answer the calls the app makes to
+google.generativeai and the Sheets v4 client, after a configurable
+latency and with a configurable error rate, so load tests never leave
+the machine. Both draw from a seeded random generator, so a run with the
+same settings sees the same sequence of delays and failures.
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class FakeUpstreamError(RuntimeError):
+    """Injected upstream failure"""
+
+
+class LatencyModel:
+    """Uniform latency around a mean plus a failure probability, drawn from a seeded generator"""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float, seed: int):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> Tuple[float, bool]:
+        """Next (delay in seconds, whether the call fails)"""
+        with self._lock:
+            delay = self._random.uniform(max(0.0, self.latency - self.jitter), self.latency + self.jitter)
+            return delay, self._random.random() < self.error_rate
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeStream:
+    """Streamed response: the answer in a few chunks spread over the rest of the delay"""
+
+    def __init__(self, text: str, delay: float, chunks: int = 4):
+        words = text.split(" ")
+        size = max(1, -(-len(words) // chunks))
+        self.parts = [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)]
+        self.gap = delay / len(self.parts)
+
+    async def __aiter__(self):
+        for part in self.parts:
+            await asyncio.sleep(self.gap)
+            yield FakeResponse(part)
+
+
+class FakeGeminiModel:
+    """
+    Replacement for genai.GenerativeModel
+
+    The answer is derived from a hash of the prompt, so the same question
+    with the same context always gets the same text. A streamed call
+    returns after half the delay and spreads its chunks over the other half.
+    """
+
+    def __init__(self, latency: LatencyModel, answer_words: int = 60):
+        self.latency = latency
+        self.answer_words = answer_words
+        self.calls = 0
+        self.failures = 0
+
+    def answer(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode()).hexdigest()
+        return " ".join(digest[i % 56:i % 56 + 8] for i in range(self.answer_words))
+
+    async def generate_content_async(self, prompt: str, stream: bool = False) -> Any:
+        self.calls += 1
+        delay, fails = self.latency.draw()
+        await asyncio.sleep(delay / 2 if stream else delay)
+        if fails:
+            self.failures += 1
+            raise FakeUpstreamError("injected Gemini failure")
+        text = self.answer(prompt)
+        return FakeStream(text, delay / 2) if stream else FakeResponse(text)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "failures": self.failures}
+
+
+class FakeSheetsRequest:
+    def __init__(self, service: "FakeSheetsService", rows: List[List[Any]]):
+        self.service = service
+        self.rows = rows
+
+    def execute(self, http: Optional[Any] = None) -> Dict[str, Any]:
+        """Block for the drawn delay like the real client, then fail or count the rows"""
+        service = self.service
+        delay, fails = service.latency.draw()
+        time.sleep(delay)
+        with service.lock:
+            service.calls += 1
+            if fails:
+                service.failures += 1
+                raise FakeUpstreamError("injected Sheets failure")
+            service.rows_appended += len(self.rows)
+        return {"updates": {"updatedRows": len(self.rows)}}
+
+
+class FakeSheetsService:
+    """Replacement for the Sheets v4 service: spreadsheets().values().append(...).execute()"""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.rows_appended = 0
+
+    def spreadsheets(self) -> "FakeSheetsService":
+        return self
+
+    def values(self) -> "FakeSheetsService":
+        return self
+
+    def append(self, body: Dict[str, Any], **kwargs: Any) -> FakeSheetsRequest:
+        return FakeSheetsRequest(self, body["values"])
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"calls": self.calls, "failures": self.failures, "rows_appended": self.rows_appended}
+
+
+def install(gemini: FakeGeminiModel, sheets: FakeSheetsService) -> None:
+    """Point the shared Google clients at the fakes; the SDKs are never imported"""
+    from app.core.clients import google_clients
+
+    with google_clients._lock:
+        google_clients._gemini_model = gemini
+        google_clients._gemini_configured = True
+    google_clients.sheets = lambda: sheets
+    google_clients.sheets_http = lambda: None
@@ -0,0 +1,31 @@
+"""
+Gunicorn settings for multi-process serving
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Worker count and preloading come from app.core.config.Settings
+(WEB_CONCURRENCY, PRELOAD_APP). For single-process development, run
+uvicorn directly as described in the README.
+"""
+import os
+
+from app.core.config import settings
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = settings.WEB_CONCURRENCY
+preload_app = settings.PRELOAD_APP
+worker_class = "uvicorn.workers.UvicornWorker"
+# Streamed chat answers can take longer than gunicorn's 30 s default
+timeout = 120
+graceful_timeout = 30
+
+
+def when_ready(server):
+    """Load the catalogs in the master so forked workers start with them mapped"""
+    if not preload_app:
+        return
+    from app.core.catalog import projects_catalog, skills_catalog
+
+    for catalog in (projects_catalog, skills_catalog):
+        snapshot = catalog.get()
+        server.log.info(f"Preloaded {catalog.name} version {snapshot.version}")
@@ -0,0 +1,81 @@
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def make_cache(threshold=0.75, ttl=60, max_entries=10):
+    return ResponseCache(ttl_seconds=ttl, max_entries=max_entries, similarity_threshold=threshold)
+
+
+def test_normalized_exact_hit():
+    cache = make_cache()
+    cache.set("What are your skills?", "skills answer")
+    assert cache.get("what skills") == "skills answer"
+    assert (cache.hits, cache.near_hits, cache.misses) == (1, 0, 0)
+
+
+def test_paraphrase_is_a_near_hit():
+    cache = make_cache()
+    cache.set("What projects have you built with Python?", "python answer")
+    assert cache.get("what projects did you build with python") == "python answer"
+    assert (cache.hits, cache.near_hits, cache.misses) == (0, 1, 0)
+
+
+def test_unrelated_question_misses():
+    cache = make_cache()
+    cache.set("What projects have you built with Python?", "python answer")
+    assert cache.get("What is your email address?") is None
+    assert cache.misses == 1
+
+
+def test_different_question_word_never_matches():
+    cache = make_cache(threshold=0.1)
+    cache.set("Where did you study?", "where answer")
+    assert cache.get("When did you study?") is None
+    assert cache.near_hits == 0
+
+
+def test_near_matching_is_off_without_threshold():
+    cache = make_cache(threshold=0.0)
+    cache.set("What projects have you built with Python?", "python answer")
+    assert cache.get("what projects did you build with python") is None
+
+
+def test_best_match_wins():
+    cache = make_cache(threshold=0.5)
+    cache.set("What projects use Docker?", "docker answer")
+    cache.set("What projects use Python?", "python answer")
+    assert cache.get("which projects use python") is None
+    assert cache.get("what projects used python") == "python answer"
+
+
+def test_expired_entry_is_not_a_near_hit(clock):
+    cache = make_cache(ttl=10)
+    cache.set("What projects have you built with Python?", "python answer")
+    clock.now += 11
+    assert cache.get("what projects did you build with python") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_evicted_entry_leaves_the_index():
+    cache = make_cache(max_entries=1)
+    cache.set("What projects have you built with Python?", "python answer")
+    cache.set("What is your email address?", "email answer")
+    assert cache.get("what projects did you build with python") is None
+    assert all(cache._entries.keys() >= keys for keys in cache._postings.values())
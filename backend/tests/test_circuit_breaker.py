@@ -0,0 +1,137 @@
+import pytest
+
+from app.core import circuit_breaker as breaker_module
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", clock)
+    return clock
+
+
+def make_breaker(**overrides):
+    options = dict(window=10, min_calls=4, failure_rate=0.5, cooldown=30, probes=2)
+    options.update(overrides)
+    return CircuitBreaker("test", **options)
+
+
+def succeed(breaker, latency=0.1):
+    with breaker.guard() as call:
+        call.succeeded(latency)
+
+
+def fail(breaker):
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("upstream error")
+
+
+def trip(breaker):
+    for _ in range(breaker.min_calls):
+        fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_min_calls_and_failure_rate(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        fail(breaker)
+    assert breaker.state == CLOSED
+
+    breaker = make_breaker()
+    for _ in range(3):
+        succeed(breaker)
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_opens_at_failure_rate_and_fails_fast(clock):
+    breaker = make_breaker()
+    succeed(breaker)
+    fail(breaker)
+    succeed(breaker)
+    fail(breaker)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+    assert breaker.short_circuited == 2
+
+
+def test_half_open_after_cooldown_and_closes_after_probes(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 29
+    assert breaker.is_open()
+    clock.now += 1
+    assert not breaker.is_open()
+    assert breaker.stats()["state"] == HALF_OPEN
+
+    succeed(breaker)
+    assert breaker.state == HALF_OPEN
+    succeed(breaker)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["window_calls"] == 0
+    assert [(t["from"], t["to"]) for t in breaker.transitions] == [
+        (CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED),
+    ]
+
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30
+    fail(breaker)
+    assert breaker.state == OPEN
+    assert breaker.is_open()
+    clock.now += 30
+    succeed(breaker)
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_admits_only_the_probe_budget(clock):
+    breaker = make_breaker(probes=1)
+    trip(breaker)
+    clock.now += 30
+    with breaker.guard() as call:
+        with pytest.raises(CircuitOpenError):
+            with breaker.guard():
+                pass
+        call.succeeded(0.1)
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe_releases_its_slot(clock):
+    breaker = make_breaker(probes=1)
+    trip(breaker)
+    clock.now += 30
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard():
+            raise KeyboardInterrupt
+    assert breaker.state == HALF_OPEN
+    succeed(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_timeout_tracks_observed_latency(clock):
+    breaker = make_breaker(min_timeout=1, max_timeout=10, timeout_multiplier=2)
+    assert breaker.timeout() == 10
+    for _ in range(4):
+        succeed(breaker, latency=2.0)
+    assert breaker.timeout() == 4.0
+    for _ in range(4):
+        succeed(breaker, latency=0.1)
+    assert breaker.timeout() == 4.0
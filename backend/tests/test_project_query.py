@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import date
+
+import pytest
+
+from app.core.project_query import InvalidCursor, ProjectQueryIndex, decode_cursor, encode_cursor
+
+PROJECTS = [
+    {"id": 1, "title": "Beta", "start_date": "2023-01-01", "end_date": "2023-06-01", "tech_stack": ["Python"]},
+    {"id": 2, "title": "alpha", "start_date": "2024-02-01", "tech_stack": ["Python", "Docker"], "is_featured": True},
+    {"id": 3, "title": "Gamma", "tech_stack": ["Go"]},
+    {"id": 4, "title": "Alpha", "start_date": "2022-05-01", "end_date": "2022-09-01", "tech_stack": ["docker"]},
+    {"id": 5, "title": "Delta", "start_date": "2024-03-01", "tech_stack": ["Python"], "is_featured": True},
+]
+
+
+def raw_cursor(payload):
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def collect_pages(index, sort, descending=False, limit=2, **filters):
+    ids, after = [], None
+    while True:
+        page, _, next_key = index.query(sort=sort, descending=descending, after=after, limit=limit, **filters)
+        ids.extend(page)
+        if next_key is None:
+            return ids
+        # Round-trip through the wire format, as a client would
+        after = decode_cursor(encode_cursor(sort, next_key), sort)
+
+
+@pytest.mark.parametrize(
+    "field, key",
+    [
+        ("id", (1, 7, 7)),
+        ("title", (1, "alpha", 2)),
+        ("title", (0, "", 3)),
+        ("start_date", (1, date(2024, 2, 1), 2)),
+        ("end_date", (0, "", 5)),
+    ],
+)
+def test_cursor_round_trip(field, key):
+    cursor = encode_cursor(field, key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, field) == key
+
+
+@pytest.mark.parametrize(
+    "field, cursor",
+    [
+        ("title", "not a cursor!"),
+        ("title", raw_cursor(["title", 1, "x"])),
+        ("title", raw_cursor({"field": "title"})),
+        ("title", raw_cursor(["title", 1, 5, 1])),
+        ("title", raw_cursor(["title", 1, "x", "abc"])),
+        ("title", raw_cursor(["title", 1, "x", None])),
+        ("title", raw_cursor(["title", 2, "x", 1])),
+        ("title", raw_cursor(["title", True, "x", 1])),
+        ("title", raw_cursor(["title", 0, "x", 1])),
+        ("id", raw_cursor(["id", 1, True, 1])),
+        ("start_date", raw_cursor(["start_date", 1, "2024-13-01", 1])),
+        ("start_date", raw_cursor(["start_date", 1, 20240101, 1])),
+    ],
+)
+def test_tampered_cursor_is_rejected(field, cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, field)
+
+
+def test_cursor_for_another_sort_is_rejected():
+    cursor = encode_cursor("title", (1, "alpha", 2))
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "id")
+
+
+@pytest.mark.parametrize("sort", ["id", "title", "start_date", "end_date"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_match_once_in_order(sort, descending):
+    index = ProjectQueryIndex(PROJECTS)
+    everything, total, next_key = index.query(sort=sort, descending=descending, limit=len(PROJECTS))
+    assert total == len(PROJECTS) and next_key is None
+    assert collect_pages(index, sort, descending) == everything
+
+
+def test_title_sort_is_case_insensitive_with_id_tiebreak():
+    index = ProjectQueryIndex(PROJECTS)
+    page, _, _ = index.query(sort="title", limit=10)
+    assert page == [2, 4, 1, 5, 3]
+
+
+def test_filters_and_paging_combine():
+    index = ProjectQueryIndex(PROJECTS)
+    assert collect_pages(index, "id", tech=["PYTHON"], limit=1) == [1, 2, 5]
+    assert collect_pages(index, "id", tech=["python", "docker"], match_all=False, limit=1) == [1, 2, 4, 5]
+    assert index.query(tech=["python", "docker"])[0] == [2]
+    assert index.query(featured=False)[0] == [1, 3, 4]
+    assert index.query(tech=["rust"]) == ([], 0, None)
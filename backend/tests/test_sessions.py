@@ -0,0 +1,109 @@
+import pytest
+
+from app.core import sessions as sessions_module
+from app.core.sessions import NEW_SESSION, SessionStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(sessions_module.time, "monotonic", clock)
+    return clock
+
+
+def make_store(**overrides):
+    options = dict(ttl_seconds=60, max_sessions=3, max_bytes=10_000_000, max_turns=4, max_turn_chars=100)
+    options.update(overrides)
+    return SessionStore(**options)
+
+
+def test_sessions_are_opt_in(clock):
+    store = make_store()
+    assert store.resolve(None) is None
+    assert store.resolve("") is None
+    session_id = store.resolve(NEW_SESSION)
+    assert session_id and session_id != NEW_SESSION
+    assert store.stats()["sessions"] == 0
+
+
+def test_unknown_id_gets_a_fresh_session(clock):
+    store = make_store()
+    assert store.resolve("forged") not in ("forged", None)
+
+
+def test_session_expires_after_idle_ttl(clock):
+    store = make_store(ttl_seconds=60)
+    store.record("s1", "q1", "a1")
+    clock.now += 59
+    assert store.resolve("s1") == "s1"
+    # A turn pushes the expiry back
+    store.record("s1", "q2", "a2")
+    clock.now += 59
+    assert store.turns("s1") == [("q1", "a1"), ("q2", "a2")]
+    clock.now += 1
+    assert store.turns("s1") == []
+    assert store.resolve("s1") != "s1"
+    assert store.evictions["expired"] == 1
+    assert store.stats()["bytes"] == 0
+
+
+def test_expired_sessions_are_evicted_on_record(clock):
+    store = make_store(ttl_seconds=60)
+    store.record("old", "q", "a")
+    clock.now += 61
+    store.record("new", "q", "a")
+    assert store.stats()["sessions"] == 1
+    assert store.evictions["expired"] == 1
+
+
+def test_least_recently_used_session_is_evicted(clock):
+    store = make_store(max_sessions=3)
+    for session_id in ("s1", "s2", "s3"):
+        store.record(session_id, "q", "a")
+    # s1 becomes the most recently used
+    store.record("s1", "q", "a")
+    store.record("s4", "q", "a")
+    assert store.turns("s2") == []
+    assert [len(store.turns(s)) for s in ("s1", "s3", "s4")] == [2, 1, 1]
+    assert store.evictions["lru"] == 1
+
+
+def test_memory_cap_evicts_oldest_but_keeps_the_current_session(clock):
+    probe = make_store()
+    probe.record("s1", "q" * 100, "a" * 100)
+    per_session = probe.stats()["bytes"]
+
+    store = make_store(max_sessions=100, max_bytes=per_session * 2)
+    for session_id in ("s1", "s2", "s3"):
+        store.record(session_id, "q" * 100, "a" * 100)
+    assert store.stats()["sessions"] == 2
+    assert store.turns("s1") == []
+    assert store.evictions["memory"] == 1
+    assert store.nbytes <= store.max_bytes
+
+    tiny = make_store(max_bytes=1)
+    tiny.record("only", "q", "a")
+    assert tiny.turns("only") == [("q", "a")]
+
+
+def test_turns_are_bounded_and_byte_count_stays_exact(clock):
+    store = make_store(max_turns=2, max_turn_chars=5)
+    for n in range(5):
+        store.record("s1", f"question {n}", f"answer {n}")
+    assert store.turns("s1") == [("quest", "answe"), ("quest", "answe")]
+    stats = store.session_stats("s1")
+    assert stats["turns"] == 2
+    assert store.nbytes == stats["bytes"]
+
+    fresh = make_store(max_turns=2, max_turn_chars=5)
+    fresh.record("s1", "quest", "answe")
+    fresh.record("s1", "quest", "answe")
+    assert fresh.nbytes == store.nbytes
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from app.core import spool as spool_module
+from app.core.spool import WriteBehindSpool
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(spool_module.time, "time", clock)
+    monkeypatch.setattr(spool_module.random, "uniform", lambda low, high: high)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "spool.sqlite3"
+
+
+class Recorder:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError("upstream down")
+        self.batches.append(rows)
+
+
+def test_rows_are_delivered_once_in_order(clock, path):
+    spool = WriteBehindSpool(path, batch_size=2)
+    for n in range(3):
+        spool.enqueue([n, f"row {n}"])
+    send = Recorder()
+    assert spool.flush_once(send) == 2
+    assert spool.flush_once(send) == 1
+    assert spool.flush_once(send) == 0
+    assert send.batches == [[[0, "row 0"], [1, "row 1"]], [[2, "row 2"]]]
+    assert spool.pending() == 0
+
+
+def test_leased_batch_is_skipped_by_other_flushers(clock, path):
+    owner = WriteBehindSpool(path, lease=120)
+    other = WriteBehindSpool(path, lease=120)
+    owner.enqueue(["a"])
+    assert [row for _, _, row in owner._due_batch()] == [["a"]]
+    assert other.flush_once(Recorder()) == 0
+
+
+def test_rows_leased_by_a_crashed_flusher_are_replayed(clock, path):
+    crashed = WriteBehindSpool(path, lease=120)
+    crashed.enqueue(["a"])
+    crashed.enqueue(["b"])
+    # The flusher leased the batch and died before acknowledging it
+    crashed._due_batch()
+    crashed._conn.close()
+
+    restarted = WriteBehindSpool(path, lease=120)
+    send = Recorder()
+    assert restarted.pending() == 2
+    assert restarted.flush_once(send) == 0
+    clock.now += 121
+    assert restarted.flush_once(send) == 2
+    assert send.batches == [[["a"], ["b"]]]
+    assert restarted.pending() == 0
+
+
+def test_failed_batch_backs_off_and_is_retried(clock, path):
+    spool = WriteBehindSpool(path, retry_base=2, retry_max=300)
+    spool.enqueue(["a"])
+    down = Recorder(fail=True)
+    assert spool.flush_once(down) == 0
+    assert spool.pending() == 1
+    clock.now += 1.9
+    assert spool.flush_once(Recorder()) == 0
+    clock.now += 0.2
+    assert spool.flush_once(down) == 0
+    # Second failure: the backoff doubles
+    clock.now += 3.9
+    assert spool.flush_once(Recorder()) == 0
+    clock.now += 0.2
+    send = Recorder()
+    assert spool.flush_once(send) == 1
+    assert send.batches == [[["a"]]]
+
+
+def test_start_replays_rows_left_from_a_previous_run(path):
+    WriteBehindSpool(path).enqueue(["left over"])
+
+    async def run():
+        spool = WriteBehindSpool(path, flush_interval=0.05)
+        send = Recorder()
+        spool.start(send)
+        try:
+            for _ in range(100):
+                if send.batches:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await spool.stop()
+        return spool, send
+
+    spool, send = asyncio.run(run())
+    assert send.batches == [[["left over"]]]
+    assert spool.pending() == 0
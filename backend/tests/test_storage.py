@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from app.core.storage import CatalogStore, StagedImport
+
+
+def project(title, **fields):
+    return {"title": title, "description": f"{title} description", **fields}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    directory = tmp_path / "data"
+    directory.mkdir()
+    (directory / "projects.json").write_text(json.dumps([{"id": 1, **project("Original")}]))
+    (directory / "skills.json").write_text("[]")
+    return directory
+
+
+@pytest.fixture
+def store(tmp_path, data_dir):
+    store = CatalogStore(tmp_path / "catalog.sqlite3")
+    store.import_json(data_dir=data_dir)
+    return store
+
+
+def stage(store, rows, **options):
+    staged = StagedImport(store, "projects", source="upload.jsonl", **options)
+    for line, row in enumerate(rows, start=1):
+        if staged.add(line, row):
+            staged.flush()
+    return staged
+
+
+def titles(store):
+    _, items, _ = store.rows("projects")
+    return [(item["id"], item["title"]) for item in items]
+
+
+def test_commit_swaps_in_every_staged_row(store):
+    before = store.version("projects")
+    staged = stage(store, [project("A"), project("B", id=10), project("C")], batch_size=2)
+    try:
+        version = staged.commit()
+    finally:
+        staged.close()
+    assert version == before[0] + 1
+    assert titles(store) == [(1, "A"), (10, "B"), (11, "C")]
+    assert staged.accepted == 3 and staged.rejected == 0
+    # A catalog written by an admin import no longer follows its JSON file
+    assert store.seed("projects") is None
+
+
+def test_encoded_rows_match_the_model(store):
+    staged = stage(store, [project("A", tech_stack=["Python"], extra="kept")])
+    try:
+        staged.commit()
+    finally:
+        staged.close()
+    _, items, encoded = store.rows("projects")
+    assert items[0]["extra"] == "kept"
+    assert json.loads(encoded[0]) == {
+        "title": "A", "description": "A description", "image_url": None, "project_url": None,
+        "github_url": None, "tech_stack": ["Python"], "start_date": None, "end_date": None,
+        "is_featured": False, "id": 1,
+    }
+
+
+def test_readers_see_the_old_catalog_until_commit(store):
+    before = store.version("projects")
+    staged = stage(store, [project("A"), project("B")], batch_size=1)
+    try:
+        staged.flush()
+        assert store.version("projects") == before
+        assert titles(store) == [(1, "Original")]
+        staged.commit()
+    finally:
+        staged.close()
+    assert titles(store) == [(1, "A"), (2, "B")]
+
+
+@pytest.mark.parametrize(
+    "bad_row, error",
+    [
+        ("not an object", "expected a JSON object"),
+        ({"description": "no title"}, "title"),
+        (project("Bad date", start_date="yesterday"), "start_date"),
+        (project("Bad id", id=0), "id: must be a positive integer"),
+        (project("Bool id", id=True), "id: must be a positive integer"),
+        (project("Duplicate", id=1), "id: duplicate id 1"),
+    ],
+)
+def test_any_rejected_row_leaves_the_catalog_untouched(store, bad_row, error):
+    before = store.version("projects")
+    staged = stage(store, [project("A", id=1), bad_row, project("C")], batch_size=1)
+    try:
+        assert staged.commit() is None
+    finally:
+        staged.close()
+    assert staged.rejected == 1
+    assert staged.errors[0]["line"] == 2
+    assert error in staged.errors[0]["error"]
+    assert store.version("projects") == before
+    assert titles(store) == [(1, "Original")]
+
+
+def test_errors_are_capped_but_counted(store):
+    staged = stage(store, ["x"] * 5, max_errors=2)
+    try:
+        assert staged.commit() is None
+    finally:
+        staged.close()
+    assert staged.rejected == 5
+    assert [error["line"] for error in staged.errors] == [1, 2]
+
+
+def test_abandoned_import_leaves_the_catalog_untouched(store, tmp_path):
+    before = store.version("projects")
+    staged = stage(store, [project("A"), project("B")])
+    staged.flush()
+    staged.close()
+    reopened = CatalogStore(tmp_path / "catalog.sqlite3")
+    assert reopened.version("projects") == before
+    assert titles(reopened) == [(1, "Original")]
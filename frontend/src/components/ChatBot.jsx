@@ -266,6 +266,8 @@ const ChatBot = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [errorCount, setErrorCount] = useState(0);
   const messagesEndRef = useRef(null);
+  // Server-side conversation id, so follow-up questions keep their context
+  const sessionIdRef = useRef(null);
   
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -353,9 +355,14 @@ const ChatBot = () => {
     try {
       setIsLoading(true);
       const response = await axios.post(`${process.env.REACT_APP_API_URL}/api/chatbot/chat`, {
-        message: text
+        message: text,
+        // 'new' starts a conversation; later messages continue it
+        session_id: sessionIdRef.current || 'new'
       });
       
+      if (response.data && response.data.session_id) {
+        sessionIdRef.current = response.data.session_id;
+      }
       if (response.data && response.data.response) {
         setMessages(prev => [...prev, { text: response.data.response, isUser: false }]);
       } else {
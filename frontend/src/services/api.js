@@ -59,6 +59,22 @@ const staticSkillsData = {
   ]
 };
 
+// Bootstrap API: all first-paint data in one request, shared by every caller
+let bootstrapRequest = null;
+
+export const getBootstrap = () => {
+  if (!bootstrapRequest) {
+    bootstrapRequest = api.get('/api/bootstrap')
+      .then(response => response.data)
+      .catch(error => {
+        // Let the next caller retry instead of reusing the failure
+        bootstrapRequest = null;
+        throw error;
+      });
+  }
+  return bootstrapRequest;
+};
+
 // Projects API
 export const getProjects = async () => {
   // For now, we'll return the static data
@@ -68,8 +84,8 @@ export const getProjects = async () => {
 
 export const getFeaturedProjects = async () => {
   try {
-    const response = await api.get('/projects/featured');
-    return response.data;
+    const data = await getBootstrap();
+    return data.featured;
   } catch (error) {
     console.error('Error fetching featured projects:', error);
     throw error;
@@ -102,14 +118,14 @@ export const getSkills = async () => {
 
 export const getSkillsByCategory = async () => {
   try {
-    const response = await api.get('/skills/categories');
-    console.log('API Response:', response.data);
+    const data = await getBootstrap();
+    console.log('API Response:', data);
     // If API fails, use static data
-    if (!response.data || !response.data.categories) {
+    if (!data || !data.skill_categories) {
       console.log('Using static data');
       return staticSkillsData.categories;
     }
-    return response.data.categories;
+    return data.skill_categories;
   } catch (error) {
     console.error('Error fetching skills:', error);
     // Fallback to static data if API fails
@@ -130,9 +146,11 @@ export const submitContactForm = async (formData) => {
 };
 
 // Chatbot API
-export const sendChatbotMessage = async (message) => {
+export const sendChatbotMessage = async (message, sessionId = null) => {
   try {
-    const response = await api.post('/chatbot/chat', { message });
+    // 'new' starts a conversation and the answer returns its session_id; pass
+    // that back to continue it. Without one the message is answered on its own.
+    const response = await api.post('/chatbot/chat', { message, session_id: sessionId });
     return response.data;
   } catch (error) {
     console.error('Error sending message to chatbot:', error);